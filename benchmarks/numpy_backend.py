@@ -0,0 +1,59 @@
+"""
+Python vs NumPy backend benchmark.
+
+Times simulate_fcfs, simulate_scan and simulate_cscan (schedule plus
+total_seek) with both backends on the same uniform random workload and
+prints the speedup. Defaults to 10^6 requests.
+
+Usage:
+    python benchmarks/numpy_backend.py [--count 1000000] [--disk-size 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.disk import Disk
+from simulator.algorithms import simulate_fcfs, simulate_scan, simulate_cscan
+from simulator import vectorized
+
+
+def best_time(fn, requests, disk, backend, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(requests, disk, backend=backend)
+        result.total_seek
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy backend benchmark")
+    parser.add_argument("--count", "-n", type=int, default=1_000_000)
+    parser.add_argument("--disk-size", "-d", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if not vectorized.HAVE_NUMPY:
+        sys.exit("NumPy is not installed; nothing to compare.")
+
+    rng = random.Random(args.seed)
+    requests = [rng.randrange(args.disk_size) for _ in range(args.count)]
+    disk = Disk(size=args.disk_size, head=args.disk_size // 2)
+
+    print(f"{args.count} requests, best of {args.repeat}")
+    print(f"{'algorithm':<10} {'python (s)':>11} {'numpy (s)':>10} {'speedup':>8}")
+    for name, fn in (("FCFS", simulate_fcfs), ("SCAN", simulate_scan), ("C-SCAN", simulate_cscan)):
+        py = best_time(fn, requests, disk, "python", args.repeat)
+        vec = best_time(fn, requests, disk, "numpy", args.repeat)
+        print(f"{name:<10} {py:>11.4f} {vec:>10.4f} {py / vec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
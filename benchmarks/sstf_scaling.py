@@ -0,0 +1,52 @@
+"""
+Scaling benchmark for the SSTF engine.
+
+Runs simulate_sstf on uniform random workloads from 10^3 to 10^6 requests
+and prints the run time next to time / (n log2 n).  If the engine is
+linearithmic the last column stays roughly flat as n grows.
+
+Usage:
+    python benchmarks/sstf_scaling.py [--disk-size 1000000] [--seed 1]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.disk import Disk
+from simulator.algorithms import simulate_sstf
+
+
+def time_sstf(n, disk_size, rng, repeat=3):
+    requests = [rng.randrange(disk_size) for _ in range(n)]
+    disk = Disk(size=disk_size, head=disk_size // 2)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        simulate_sstf(requests, disk)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSTF scaling benchmark")
+    parser.add_argument("--disk-size", "-d", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'n':>9} {'seconds':>10} {'ns / (n log2 n)':>16}")
+    for exp in range(3, 7):
+        n = 10 ** exp
+        seconds = time_sstf(n, args.disk_size, rng, repeat=3 if exp < 6 else 1)
+        per_op = seconds / (n * math.log2(n)) * 1e9
+        print(f"{n:>9} {seconds:>10.4f} {per_op:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,14 @@
 import argparse
-from tabulate import tabulate
+import sys
+from itertools import count
 
-from simulator.disk import Disk
-#from simulator.algorithms import simulate_fcfs, simulate_sstf
-from simulator.algorithms import (
-    simulate_fcfs,
-    simulate_sstf,
-    simulate_scan,
-    simulate_cscan,
-)
+from simulator import registry
+from simulator.disk import Disk, DriveGeometry
+from simulator.instrument import phase
+# Everything else is imported only when needed: the table printers import
+# tabulate, the trace, workload and output branches import their modules,
+# simulator.registry imports an algorithm's module when it is first run,
+# and simulator.vectorized imports NumPy only for the NumPy code paths.
 
 
 def parse_requests(s):
@@ -20,17 +20,445 @@ def parse_requests(s):
     return [int(x.strip()) for x in s.split(",") if x.strip()]
 
 
-def main():
+def parse_int_list(s):
+    """
+    Parse a comma-separated list of integers for sweep axes, e.g. "1,-1"
+    """
+    return [int(x) for x in parse_requests(s)]
+
+
+def load_workload(spec):
+    """
+    Parse a sweep workload given as NAME=SPEC, where SPEC is either a
+    comma-separated request list or @path to a file of comma- or
+    whitespace-separated track numbers.
+    """
+    name, sep, value = spec.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"workload must be NAME=SPEC, got {spec!r}")
+    if value.startswith("@"):
+        with open(value[1:]) as f:
+            value = f.read().replace("\n", ",").replace(" ", ",")
+    return name, parse_requests(value)
+
+
+def add_generate_arguments(parser, source):
+    """Add --generate (to the request source group) and its parameters."""
+    from simulator.workloads import KINDS
+
+    source.add_argument(
+        "--generate", "-g", choices=KINDS,
+        help="Use a seeded synthetic workload of this kind instead",
+    )
+    parser.add_argument(
+        "--count", type=int, default=1000,
+        help="Number of requests for --generate",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Random seed for --generate",
+    )
+    parser.add_argument(
+        "--generate-option", action="append", default=[], metavar="NAME=VALUE",
+        help="Parameter of the --generate kind, e.g. s=1.1 or run=32 (repeatable)",
+    )
+
+
+def generate_requests(args, size):
+    """The Workload described by the --generate arguments, for a disk of size tracks."""
+    from simulator.workloads import generate, parse_options
+
+    return generate(args.generate, args.count, size, seed=args.seed,
+                    **parse_options(args.generate_option))
+
+
+def add_trace_arguments(parser, timing=False):
+    """Add the options that say how to read --trace (timing: also the drive model's)."""
+    parser.add_argument(
+        "--trace-format", choices=["csv", "blkparse", "bin"], default="csv",
+        help="Trace format: CSV column, blkparse text, or raw int64 sectors",
+    )
+    parser.add_argument(
+        "--trace-column", type=int, default=0,
+        help="Column holding the sector number in a CSV trace",
+    )
+    parser.add_argument(
+        "--sectors-per-track", type=int, default=None,
+        help="Sectors per track: maps trace sectors to tracks"
+             + (" and sets the timing model's track size" if timing else ""),
+    )
+    parser.add_argument(
+        "--total-sectors", type=int, default=None,
+        help="Scale trace sectors 0..N-1 onto the disk's tracks "
+             "(default: highest sector in the trace)",
+    )
+
+
+def trace_options(args):
+    """Keyword arguments for load_trace / iter_trace from the trace arguments."""
+    options = {"sectors_per_track": args.sectors_per_track, "total_sectors": args.total_sectors}
+    if args.trace_format == "csv":
+        options["column"] = args.trace_column
+    return options
+
+
+def sweep_main(argv):
+    from simulator.sweep import sweep, write_csv
+
+    load_plugins(argv)
+    parser = argparse.ArgumentParser(
+        prog="run_sim.py sweep",
+        description="Run a grid of simulations in parallel",
+    )
+    parser.add_argument(
+        "--workload", "-w", type=load_workload, action="append", required=True,
+        help='Workload as NAME=82,170,43 or NAME=@requests.txt (repeatable)',
+    )
+    parser.add_argument(
+        "--algorithms", "-a", type=str, default=",".join(registry.names(default_only=True)),
+        help="Comma-separated algorithms to run (default: all but sptf)",
+    )
+    parser.add_argument(
+        "--disk-sizes", "-d", type=parse_int_list, default=[200],
+        help="Comma-separated disk sizes",
+    )
+    parser.add_argument(
+        "--heads", "-H", type=parse_int_list, default=[50],
+        help="Comma-separated starting head positions",
+    )
+    parser.add_argument(
+        "--directions", type=parse_int_list, default=[1],
+        help="Comma-separated initial directions (1, -1)",
+    )
+    parser.add_argument(
+        "--workers", "-j", type=int, default=None,
+        help="Worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=64,
+        help="Grid points per worker task",
+    )
+    parser.add_argument(
+        "--backend", "-b", choices=["python", "numpy"], default="python",
+    )
+    parser.add_argument(
+        "--csv", type=str, default=None,
+        help="Write the result table as CSV to this file ('-' for stdout)",
+    )
+    add_plugin_argument(parser)
+    args = parser.parse_args(argv)
+
+    algorithms = [a.strip() for a in args.algorithms.split(",") if a.strip()]
+    rows = sweep(
+        dict(args.workload), algorithms, args.disk_sizes, args.heads,
+        args.directions, workers=args.workers, batch_size=args.batch_size,
+        backend=args.backend, plugins=args.plugin,
+    )
+
+    if args.csv == "-":
+        write_csv(rows, sys.stdout)
+    elif args.csv:
+        with open(args.csv, "w", newline="") as f:
+            write_csv(rows, f)
+        print(f"Wrote {len(rows)} rows to {args.csv}")
+    else:
+        from tabulate import tabulate
+
+        print(tabulate(
+            [row[:-1] + (f"{row.average_seek:.2f}",) for row in rows],
+            headers=["Workload", "Algorithm", "Disk size", "Head", "Direction",
+                     "Requests", "Total seek", "Average seek"],
+            tablefmt="github",
+        ))
+
+
+def raid_main(argv):
+    from simulator.raid import LAYOUTS, simulate_array
+
+    load_plugins(argv)
+    parser = argparse.ArgumentParser(
+        prog="run_sim.py raid",
+        description="Simulate a RAID array, scheduling each member disk separately",
+    )
+    parser.add_argument("--layout", "-l", choices=LAYOUTS, default="raid0")
+    parser.add_argument("--members", "-m", type=int, default=2,
+                        help="Number of member disks")
+    parser.add_argument("--stripe", type=int, default=1,
+                        help="Stripe unit in tracks (raid0/raid10)")
+    parser.add_argument("--algorithm", "-a", choices=registry.names(), default="fcfs",
+                        help="Scheduling algorithm used on every member")
+    parser.add_argument("--disk-size", "-d", type=int, default=200,
+                        help="Tracks per member disk")
+    parser.add_argument("--head", "-H", type=int, default=50,
+                        help="Starting head position of every member")
+    parser.add_argument("--direction", choices=["up", "down"], default="up")
+    parser.add_argument("--workers", "-j", type=int, default=None,
+                        help="Worker processes (default: one per member; 0 = none)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--requests", "-r", type=str,
+                        help="Comma-separated logical track requests")
+    source.add_argument("--trace", "-t", type=str,
+                        help="Read logical requests from a trace file")
+    add_generate_arguments(parser, source)
+    parser.add_argument("--trace-format", choices=["csv", "blkparse", "bin"], default="csv")
+    parser.add_argument("--sectors-per-track", type=int, default=None)
+    add_plugin_argument(parser)
+    args = parser.parse_args(argv)
+
+    disk = Disk(
+        size=args.disk_size,
+        head=args.head,
+        direction=-1 if args.direction == "down" else 1,
+    )
+    if args.head < 0 or args.head >= disk.size:
+        raise ValueError(f"Head position {args.head} out of disk range 0..{disk.size-1}")
+
+    # Logical address space of the array: whole stripe units on every
+    # data column (mirrors do not add capacity).
+    columns = {"raid0": args.members, "raid1": 1, "raid10": args.members // 2}
+    per_column = args.disk_size - args.disk_size % args.stripe
+    if args.layout == "raid1":
+        per_column = args.disk_size
+    logical = Disk(size=per_column * max(1, columns[args.layout]))
+    writes = None
+    if args.trace:
+        from simulator.traces import load_trace
+        requests = load_trace(args.trace, args.trace_format, logical,
+                              sectors_per_track=args.sectors_per_track)
+    elif args.generate:
+        requests, _, writes = generate_requests(args, logical.size)
+    else:
+        requests = parse_requests(args.requests)
+        for req in requests:
+            if req < 0 or req >= logical.size:
+                raise ValueError(f"Request {req} out of array range 0..{logical.size-1}")
+
+    result = simulate_array(
+        requests, disk, registry.load(args.algorithm), layout=args.layout,
+        members=args.members, stripe=args.stripe, writes=writes, workers=args.workers,
+    )
+
+    from tabulate import tabulate
+
+    print(f"\nLayout: {result.layout} x{args.members}, algorithm: {args.algorithm}")
+    print(tabulate(
+        [(m.member, m.requests, m.total_seek, f"{m.average_seek:.2f}") for m in result.members],
+        headers=["Disk", "Requests", "Total seek", "Average seek"],
+        tablefmt="github",
+    ))
+    print(f"\nAggregate seek: {result.total_seek}")
+    print(f"Busiest spindle seek: {result.makespan_seek}")
+    print(f"Throughput: {result.throughput:.4f} logical requests per track of head travel "
+          "(busiest member)")
+    print(f"Write amplification (member/logical requests): {result.write_amplification:.2f}")
+    print(f"Load imbalance (max/mean requests): {result.load_imbalance:.2f}")
+    print(f"Seek imbalance (max/mean seek): {result.seek_imbalance:.2f}")
+
+
+def compare_main(argv):
+    from simulator.compare import compare, print_table
+
+    load_plugins(argv)
+    parser = argparse.ArgumentParser(
+        prog="run_sim.py compare",
+        description="Run several algorithms on one workload, sorting it only once",
+    )
+    parser.add_argument(
+        "--algorithms", "-a", type=str, default=",".join(registry.names(default_only=True)),
+        help=f"Comma-separated algorithms from {', '.join(registry.names())} "
+             "(default: all but sptf)",
+    )
+    parser.add_argument("--disk-size", "-d", type=int, default=200)
+    parser.add_argument("--head", "-H", type=int, default=50)
+    parser.add_argument("--direction", choices=["up", "down"], default="up")
+    parser.add_argument("--nstep", type=int, default=10,
+                        help="Batch size for N-step SCAN")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="BFQ: spread the requests round-robin over this many processes")
+    parser.add_argument("--queue-depth", type=int, default=None,
+                        help="Reorder only within a sliding queue of this many requests")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--requests", "-r", type=str,
+                        help="Comma-separated track requests")
+    source.add_argument("--trace", "-t", type=str,
+                        help="Read requests from a trace file")
+    add_generate_arguments(parser, source)
+    add_trace_arguments(parser)
+    parser.add_argument("--responses", action="store_true",
+                        help="Add response percentile and starvation columns")
+    add_plugin_argument(parser)
+    args = parser.parse_args(argv)
+
+    disk = Disk(
+        size=args.disk_size,
+        head=args.head,
+        direction=-1 if args.direction == "down" else 1,
+    )
+    writes = None
+    if args.trace:
+        from simulator.traces import load_trace
+        requests = load_trace(args.trace, args.trace_format, disk, **trace_options(args))
+    elif args.generate:
+        requests, _, writes = generate_requests(args, disk.size)
+    else:
+        requests = parse_requests(args.requests)
+        for req in requests:
+            if req < 0 or req >= disk.size:
+                raise ValueError(f"Request {req} out of disk range 0..{disk.size-1}")
+
+    algorithms = [a.strip() for a in args.algorithms.split(",") if a.strip()]
+    processes = None
+    if args.processes > 1:
+        processes = [i % args.processes for i in range(len(requests))]
+    print_table(compare(requests, disk, algorithms, step=args.nstep,
+                        responses=args.responses, writes=writes, processes=processes,
+                        depth=args.queue_depth))
+
+
+def service_main(argv):
+    import asyncio
+    from simulator.incremental import SCHEDULERS
+    from simulator.service import BlockQueueService, benchmark, print_report
+
     parser = argparse.ArgumentParser(
-        description="Disk Scheduling Simulator"
+        prog="run_sim.py service",
+        description="Run the asyncio block-queue service against a local load generator",
+    )
+    parser.add_argument("--policy", "-a", choices=list(SCHEDULERS), default="sstf")
+    parser.add_argument("--transport", choices=["unix", "tcp"], default="unix")
+    parser.add_argument("--clients", "-c", type=int, default=1000,
+                        help="Concurrent clients (each keeps one request outstanding)")
+    parser.add_argument("--requests", "-n", type=int, default=100,
+                        help="Requests per client")
+    parser.add_argument("--connections", type=int, default=32,
+                        help="Sockets shared by the clients")
+    parser.add_argument("--quantum", type=int, default=16,
+                        help="Dispatch decisions between event-loop yields")
+    parser.add_argument("--seek-time", type=float, default=0.0,
+                        help="Simulated seconds per track of head travel")
+    parser.add_argument("--disk-size", "-d", type=int, default=100_000)
+    parser.add_argument("--head", "-H", type=int, default=0)
+    parser.add_argument("--direction", choices=["up", "down"], default="up")
+    parser.add_argument("--nstep", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--listen", type=str, default=None,
+        help="Only serve, forever: a Unix socket path, or HOST:PORT for TCP",
+    )
+    args = parser.parse_args(argv)
+
+    disk = Disk(
+        size=args.disk_size,
+        head=args.head,
+        direction=-1 if args.direction == "down" else 1,
+    )
+
+    if args.listen:
+        async def serve():
+            service = BlockQueueService(disk, args.policy, step=args.nstep,
+                                        quantum=args.quantum, seek_time=args.seek_time)
+            host, sep, port = args.listen.rpartition(":")
+            if sep and port.isdigit():
+                address = await service.start_tcp(host or "127.0.0.1", int(port))
+            else:
+                address = await service.start_unix(args.listen)
+            print(f"Serving {args.policy} on {address[0]} {address[1]}")
+            await asyncio.Event().wait()
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    report = asyncio.run(benchmark(
+        disk, args.policy, transport=args.transport, clients=args.clients,
+        requests_per_client=args.requests, connections=args.connections,
+        quantum=args.quantum, seek_time=args.seek_time, step=args.nstep,
+        seed=args.seed,
+    ))
+    print(f"\nPolicy: {args.policy} over {args.transport}, {args.clients} clients")
+    print_report(report)
+
+
+def batch_main(argv):
+    load_plugins(argv)
+    from simulator.batch import run_batch
+    from simulator.cache import ResultCache
+
+    parser = argparse.ArgumentParser(
+        prog="run_sim.py batch",
+        description="Run JSONL jobs (one per line) in one process and write "
+                    "one JSONL result per job; see simulator/batch.py for the fields",
+    )
+    parser.add_argument("jobs", nargs="?", default="-",
+                        help="File of JSON jobs, one per line (default: stdin)")
+    parser.add_argument("--output-file", "-o", type=str, default=None,
+                        help="Write results here instead of stdout")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Also keep results in this directory across batches")
+    add_plugin_argument(parser)
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(directory=args.cache_dir)
+    source = sys.stdin if args.jobs == "-" else open(args.jobs)
+    out = open(args.output_file, "w") if args.output_file else sys.stdout
+    try:
+        jobs, failures = run_batch(source, out, cache)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    stats = cache.stats()
+    print(f"{jobs} jobs, {failures} failed, {stats.hits + stats.disk_hits} from cache",
+          file=sys.stderr)
+    return 1 if failures else 0
+
+
+SUBCOMMANDS = {
+    "sweep": sweep_main,
+    "raid": raid_main,
+    "compare": compare_main,
+    "service": service_main,
+    "batch": batch_main,
+}
+
+
+def load_plugins(argv):
+    """Import the --plugin modules in argv so their algorithms are registered."""
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument("--plugin", action="append", default=[])
+    registry.load_plugins(pre.parse_known_args(argv)[0].plugin)
+
+
+def add_plugin_argument(parser):
+    parser.add_argument(
+        "--plugin", action="append", default=[], metavar="MODULE",
+        help="Import MODULE first so the algorithms it registers can be used (repeatable)",
+    )
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+    load_plugins(argv)
+
+    parser = argparse.ArgumentParser(
+        description="Disk Scheduling Simulator",
+        epilog="Subcommands: " + ", ".join(SUBCOMMANDS)
+               + " (run 'run_sim.py <subcommand> --help')",
     )
     parser.add_argument(
         "--algorithm",
         "-a",
-        choices=["fcfs", "sstf","scan","cscan"],
+        choices=registry.names(),
         default="fcfs",
         help="Scheduling algorithm to use",
     )
+    add_plugin_argument(parser)
     parser.add_argument(
         "--disk-size", "-d", type=int, default=200,
         help="Number of tracks on disk (0..size-1)",
@@ -40,44 +468,257 @@ def main():
         help="Starting head position",
     )
     parser.add_argument(
-        "--requests", "-r", type=str, required=True,
+        "--direction", choices=["up", "down"], default="up",
+        help="Initial head direction for the SCAN/LOOK family",
+    )
+    parser.add_argument(
+        "--nstep", type=int, default=10,
+        help="Batch size for N-step SCAN",
+    )
+    parser.add_argument(
+        "--budget", type=int, default=16,
+        help="Requests per turn of a process under BFQ",
+    )
+    parser.add_argument(
+        "--queue-depth", type=int, default=None,
+        help="Reorder only within a sliding queue of this many requests, like a "
+             "drive's command queue (default: the whole request list)",
+    )
+    parser.add_argument(
+        "--processes", type=int, default=1,
+        help="BFQ: spread the requests round-robin over this many processes",
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--requests", "-r", type=str,
         help='Comma-separated list of track requests, e.g. "82,170,43,140,24,16,190"',
     )
+    source.add_argument(
+        "--trace", "-t", type=str,
+        help="Read requests from a trace file instead (see --trace-format)",
+    )
+    add_generate_arguments(parser, source)
+    add_trace_arguments(parser, timing=True)
+    parser.add_argument(
+        "--rpm", type=int, default=None,
+        help="Enable the drive timing model with this spindle speed and "
+             "report service time in ms (uses --sectors-per-track, default 63)",
+    )
+    parser.add_argument(
+        "--settle-ms", type=float, default=1.0,
+        help="Shortest seek time (head settle) for the timing model",
+    )
+    parser.add_argument(
+        "--full-seek-ms", type=float, default=15.0,
+        help="Full-stroke seek time for the timing model",
+    )
+    parser.add_argument(
+        "--seek-profile", choices=["sqrt", "linear"], default="sqrt",
+        help="Shape of the seek curve between settle and full-stroke time",
+    )
+    parser.add_argument(
+        "--sectors", type=str, default=None,
+        help="Comma-separated sector (within its track) of each request, for SPTF",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        choices=["full", "summary", "stream", "json", "csv", "binary"],
+        default="full",
+        help="full: lists and table (small runs); summary: totals only; "
+             "stream: totals and a step table written row by row; "
+             "json/csv/binary: machine-readable (binary = raw int64 positions)",
+    )
+    parser.add_argument(
+        "--responses", action="store_true",
+        help="Also report per-request response percentiles and starvation "
+             "(full, summary and stream output)",
+    )
+    parser.add_argument(
+        "--output-file", type=str, default=None,
+        help="Write the output to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--backend", "-b",
+        choices=["python", "numpy"],
+        default="python",
+        help="Implementation to use: pure Python, or vectorized NumPy "
+             "(FCFS/SCAN/C-SCAN; falls back to Python if NumPy is missing)",
+    )
+    parser.add_argument(
+        "--cache-dir", type=str, default=None,
+        help="Reuse results of identical earlier runs stored in this directory",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Print per-phase timings and decision counters to stderr",
+    )
+    parser.add_argument(
+        "--pstats", type=str, default=None,
+        help="Also write cProfile stats to this file (implies --profile)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.responses and args.output not in ("full", "summary", "stream"):
+        parser.error("--responses only applies to full, summary and stream output")
+    if args.queue_depth is not None:
+        from simulator.window import POLICIES as WINDOW_POLICIES
+        if args.queue_depth < 1:
+            parser.error("--queue-depth must be at least 1")
+        if args.algorithm not in WINDOW_POLICIES:
+            parser.error(f"--queue-depth supports {', '.join(WINDOW_POLICIES)}")
+        if args.sectors:
+            parser.error("--sectors only applies to sptf, which --queue-depth does not support")
+
+    if args.profile or args.pstats:
+        from simulator.instrument import profile_call
+        return profile_call(simulate_main, args, pstats_path=args.pstats)
+    return simulate_main(args)
+
+
+def replay_trace_window(args, disk):
+    """--queue-depth summary of a trace, streamed without loading it."""
+    from simulator.traces import iter_trace
+    from simulator.window import replay_window
 
-    args = parser.parse_args()
+    source = iter_trace(args.trace, args.trace_format, disk, **trace_options(args))
+    processes = None
+    if args.processes > 1:
+        processes = (i % args.processes for i in count())
+    stats = replay_window(source, disk, args.algorithm, args.queue_depth, args.nstep,
+                          processes=processes, budget=args.budget)
+    out = open(args.output_file, "w") if args.output_file else sys.stdout
+    try:
+        wait = stats.wait
+        out.write(f"\nAlgorithm: {stats.algorithm} (depth {stats.depth})\n")
+        out.write(f"Requests: {stats.requests}\n")
+        out.write(f"Head start: {disk.head}\n")
+        out.write(f"Total seek: {stats.total_seek}\n")
+        out.write(f"Average seek: {stats.average_seek:.2f}\n")
+        out.write(f"Queue wait (tracks): p50 {wait['p50']}  p99 {wait['p99']}  "
+                  f"max {wait['max']}\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
 
-    requests = parse_requests(args.requests)
-    disk = Disk(size=args.disk_size, head=args.head)
 
-    # Basic validation
-    for req in requests:
-        if req < 0 or req >= disk.size:
-            raise ValueError(f"Request {req} out of disk range 0..{disk.size-1}")
+def simulate_main(args):
+    """Run one simulation described by the parsed arguments and print it."""
+    geometry = None
+    if args.rpm or args.algorithm == "sptf":
+        geometry = DriveGeometry(
+            args.disk_size,
+            sectors_per_track=args.sectors_per_track or 63,
+            rpm=args.rpm or 7200,
+            settle_ms=args.settle_ms,
+            full_seek_ms=args.full_seek_ms,
+            seek_profile=args.seek_profile,
+        )
+
+    disk = Disk(
+        size=args.disk_size,
+        head=args.head,
+        direction=-1 if args.direction == "down" else 1,
+        geometry=geometry,
+    )
 
     if args.head < 0 or args.head >= disk.size:
         raise ValueError(f"Head position {args.head} out of disk range 0..{disk.size-1}")
 
-    # Choose algorithm
-    if args.algorithm == "fcfs":
-        result = simulate_fcfs(requests, disk)
-    elif args.algorithm == "sstf":
-        result = simulate_sstf(requests, disk)
-    elif args.algorithm == "scan":
-        result = simulate_scan(requests, disk)
-    elif args.algorithm == "cscan":
-        result = simulate_cscan(requests, disk)
+    if (args.trace and args.queue_depth and args.output == "summary" and not args.responses
+            and geometry is None):
+        # Nothing needs the positions: stream the trace through the queue.
+        return replay_trace_window(args, disk)
+
+    writes = None  # read/write flags, from a mixed --generate workload
+    if args.trace:
+        # Trace loaders validate every mapped track against the disk size
+        from simulator.traces import load_trace
+        with phase("trace.load"):
+            requests = load_trace(args.trace, args.trace_format, disk, **trace_options(args))
+    elif args.generate:
+        with phase("workload.generate"):
+            requests, _, writes = generate_requests(args, disk.size)
+            if args.backend == "python" and hasattr(requests, "tolist"):
+                # Plain ints are much faster than NumPy scalars in Python loops.
+                requests = requests.tolist()
+    else:
+        requests = parse_requests(args.requests)
+
+        # Basic validation
+        for req in requests:
+            if req < 0 or req >= disk.size:
+                raise ValueError(f"Request {req} out of disk range 0..{disk.size-1}")
+
+    # With --cache-dir, identical runs (same requests, disk and options)
+    # are loaded from the cache instead of being simulated again.
+    if args.cache_dir:
+        from simulator.cache import ResultCache
+        run = ResultCache(directory=args.cache_dir).run
+    else:
+        def run(sim_fn, requests, disk, **options):
+            return sim_fn(requests, disk, **options)
+
+    sectors = parse_requests(args.sectors) if args.sectors else None
+    if sectors is not None and len(sectors) != len(requests):
+        raise ValueError("--sectors must give one sector per request")
+    processes = None
+    if args.processes > 1:
+        processes = [i % args.processes for i in range(len(requests))]
+    available = {
+        "backend": args.backend,
+        "step": args.nstep,
+        "sectors": sectors,
+        "writes": writes,
+        "processes": processes,
+        "budget": args.budget,
+    }
+    if args.queue_depth:
+        from simulator.window import simulate_window
+        result = run(simulate_window, requests, disk, policy=args.algorithm,
+                     depth=args.queue_depth, step=args.nstep, writes=writes,
+                     processes=processes, budget=args.budget)
     else:
-        raise ValueError("Unsupported algorithm")
+        result = run(
+            registry.load(args.algorithm), requests, disk,
+            **registry.select_options(args.algorithm, available),
+        )
 
+    if args.output != "full":
+        from simulator.output import WRITERS, write_responses
+        writer = WRITERS[args.output]
+        if args.output_file:
+            mode = "wb" if args.output == "binary" else "w"
+            with open(args.output_file, mode) as f:
+                writer(result, disk, f)
+                if args.responses:
+                    write_responses(result, disk, f)
+        elif args.output == "binary":
+            writer(result, disk, sys.stdout.buffer)
+        else:
+            writer(result, disk, sys.stdout)
+            if args.responses:
+                write_responses(result, disk, sys.stdout)
+        return
 
     # Print results
     print(f"\nAlgorithm: {result.algorithm_name}")
-    print(f"Requests: {requests}")
+    if args.trace:
+        print(f"Requests: {len(requests)} from {args.trace}")
+    elif args.generate:
+        print(f"Requests: {len(requests)} from the {args.generate} workload (seed {args.seed})")
+    else:
+        print(f"Requests: {requests}")
     print(f"Head start: {disk.head}")
-    print(f"Positions visited: {result.positions}")
-    print(f"Seek distances: {result.seek_distances}")
+    print(f"Positions visited: {result.positions.tolist()}")
+    print(f"Seek distances: {result.seek_distances.tolist()}")
     print(f"Total seek: {result.total_seek}")
     print(f"Average seek: {result.average_seek:.2f}")
+    if result.service_times is not None:
+        print(f"Total service time: {result.total_service_ms:.2f} ms")
+        print(f"Average service time: {result.average_service_ms:.2f} ms")
+    if args.responses:
+        from simulator.output import write_responses
+        write_responses(result, disk, sys.stdout)
 
     # Simple table of steps
     rows = []
@@ -89,9 +730,11 @@ def main():
             abs(result.positions[i] - result.positions[i - 1])
         ])
 
+    from tabulate import tabulate
+
     print("\nStep-by-step movement:")
     print(tabulate(rows, headers=["Step", "From", "To", "Seek"], tablefmt="github"))
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,94 +1,568 @@
-from .disk import SimulationResult
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
 
+from .disk import DriveGeometry, SimulationResult
+from .incremental import BFQScheduler, DeadlineScheduler
+from .instrument import count, phase
+from . import vectorized
 
-def simulate_fcfs(requests, disk):
+# Every simulate_* function takes an optional progress(done, total)
+# callback. It is called every PROGRESS_EVERY serviced requests (and once
+# at the end); raising SimulationCancelled from it aborts the run.
+PROGRESS_EVERY = 16384
+
+
+class SimulationCancelled(Exception):
+    """Raised from a progress callback to stop a running simulation."""
+
+
+def _done(progress, total):
+    if progress is not None:
+        progress(total, total)
+
+
+def simulate_fcfs(requests, disk, backend="python", progress=None):
     """
     First-Come, First-Served disk scheduling.
     requests: list of track numbers
     disk: Disk object
+    backend: 'python' or 'numpy' (falls back to 'python' without NumPy)
+    """
+    with phase("FCFS.build"):
+        if vectorized.use_numpy(backend):
+            positions = vectorized.fcfs_positions(requests, disk.head)
+        else:
+            positions = array("q", [disk.head])
+            positions.extend(requests)
+    _done(progress, len(positions) - 1)
+    return SimulationResult("FCFS", positions, requests, geometry=disk.geometry, backend=backend)
+
+
+def _sstf_index(requests):
+    """
+    Collapse duplicate tracks: (count per track, first index per track).
+    """
+    counts = {}
+    first_index = {}
+    for i, r in enumerate(requests):
+        if r in counts:
+            counts[r] += 1
+        else:
+            counts[r] = 1
+            first_index[r] = i
+    return counts, first_index
+
+
+def _sstf_order(requests, head, progress=None):
+    """
+    Service order produced by SSTF, computed on a sorted request array.
+
+    Approach:
+    - Collapse duplicate tracks into (count, first index) and sort the
+      distinct tracks once.
+    - The set of serviced tracks is always a contiguous run of the sorted
+      array around the head, so the nearest pending request on each side
+      is just the neighbour of that run: keep one pointer below the head
+      and one above it and move whichever one is closer.
+    - Ties (same distance on both sides) go to the track that appears
+      first in the original request list, which is what
+      min(pending, key=...) did in the list-based version.
+
+    Runs in O(n log n) for the sort and O(n) for the sweep.
     """
-    positions = [disk.head]
-    for r in requests:
-        positions.append(r)
-    return SimulationResult("FCFS", positions, requests)
+    with phase("SSTF.index"):
+        counts, first_index = _sstf_index(requests)
+    with phase("SSTF.sort"):
+        tracks = sorted(counts)
+    return _sstf_walk(tracks, counts, first_index, head, len(requests), progress)
 
 
-def simulate_sstf(requests, disk):
+def _sstf_walk(tracks, counts, first_index, head, total, progress=None):
+    """
+    The SSTF sweep of _sstf_order over already sorted distinct tracks.
+    total is the number of requests, for progress reports.
+    """
+    hi = bisect_left(tracks, head)  # first track >= head
+    lo = hi - 1                     # last track < head
+    n = len(tracks)
+    first_hi = hi
+
+    order = array("q")
+    current = head
+    served = 0
+    with phase("SSTF.walk"):
+        while lo >= 0 and hi < n:
+            down = current - tracks[lo]
+            up = tracks[hi] - current
+            if down < up or (
+                down == up and first_index[tracks[lo]] < first_index[tracks[hi]]
+            ):
+                closest = tracks[lo]
+                lo -= 1
+            else:
+                closest = tracks[hi]
+                hi += 1
+
+            # Duplicates are at distance 0 once the head is there, so they
+            # are always serviced back to back.
+            order.extend(array("q", [closest]) * counts[closest])
+            current = closest
+
+            if progress is not None:
+                served += 1
+                if served % PROGRESS_EVERY == 0:
+                    progress(len(order), total)
+
+        # Both pointers moved once per two-sided decision.
+        compared = (first_hi - 1 - lo) + (hi - first_hi)
+
+        # One side has run out: the rest is served moving away from the head.
+        for closest in (tracks[hi:] if lo < 0 else tracks[lo::-1]):
+            order.extend(array("q", [closest]) * counts[closest])
+            if progress is not None:
+                served += 1
+                if served % PROGRESS_EVERY == 0:
+                    progress(len(order), total)
+
+    count("SSTF.decisions", n)
+    count("SSTF.comparisons", compared)
+    _done(progress, len(order))
+    return order
+
+
+def simulate_sstf(requests, disk, backend="python", progress=None):
     """
     Shortest Seek Time First.
     Always serve the closest pending request to the current head position.
+
+    backend is accepted for a uniform signature; each SSTF step depends on
+    the previous one, so there is no vectorized version.
     """
-    pending = requests.copy()
-    current = disk.head
-    positions = [current]
+    positions = array("q", [disk.head])
+    positions.extend(_sstf_order(requests, disk.head, progress))
+    return SimulationResult("SSTF", positions, requests, geometry=disk.geometry, backend=backend)
 
-    while pending:
-        # Find request with minimum distance from current
-        closest = min(pending, key=lambda r: abs(r - current))
-        positions.append(closest)
-        current = closest
-        pending.remove(closest)
 
-    return SimulationResult("SSTF", positions, requests)
+def _partition(requests, head, direction, presorted=False):
+    """
+    Sort the queue once and split it at the head.
 
+    Returns (ahead, behind):
+      ahead  = requests the head reaches by moving in `direction`
+               (including any at the head), in the order it reaches them
+      behind = the rest, in ascending order
 
-def simulate_scan(requests, disk):
+    presorted: requests is already an ascending list (it is not modified)
     """
-    SCAN (Elevator) algorithm.
-    We assume the head initially moves towards higher track numbers.
+    ordered = requests if presorted else sorted(requests)
+    if direction >= 0:
+        cut = bisect_left(ordered, head)
+        return ordered[cut:], ordered[:cut]
+    cut = bisect_right(ordered, head)
+    return ordered[:cut][::-1], ordered[cut:]
+
+
+def _sweep(requests, head, direction, size, circular, edges, presorted=False):
+    """
+    Shared engine for SCAN, C-SCAN, LOOK and C-LOOK.
 
     Approach:
-    - Split requests into:
-        left  = requests < head
-        right = requests >= head
-    - Serve 'right' in ascending order (moving up),
-      then 'left' in descending order (moving down).
+    - Partition the queue around the head in one sort (_partition).
+    - Serve everything ahead of the head in the current direction.
+    - If anything is left behind the head:
+        SCAN    travels on to the disk edge, reverses and serves it on the
+                way back (LOOK reverses at the last request instead).
+        C-SCAN  travels on to the edge, returns to the opposite edge and
+                serves it moving in the same direction as before
+                (C-LOOK jumps straight to the farthest pending request).
+    - Edge visits are recorded as positions too, so the seek totals are
+      the distance the head really moves, and their indices are
+      returned as waypoints.
+
+    presorted: requests is already an ascending list (see _partition).
+
+    Returns (positions, waypoints, direction the head ends up moving in).
     """
-    current = disk.head
-    positions = [current]
+    up = direction >= 0
+    ahead, behind = _partition(requests, head, direction, presorted)
+
+    positions = array("q", [head])
+    positions.extend(ahead)
+    waypoints = []
 
-    left = sorted([r for r in requests if r < current])
-    right = sorted([r for r in requests if r >= current])
+    if not behind:
+        return positions, waypoints, direction
 
-    # Move up (increasing tracks)
-    for r in right:
-        positions.append(r)
-        current = r
+    last = positions[-1]
+    if circular:
+        if not up:
+            behind.reverse()
+        end, start = (size - 1, 0) if up else (0, size - 1)
+        if edges:
+            if last != end:
+                waypoints.append(len(positions))
+                positions.append(end)
+            if behind[0] != start:
+                waypoints.append(len(positions))
+                positions.append(start)
+        positions.extend(behind)
+        return positions, waypoints, direction
 
-    # Then move down (decreasing tracks)
-    for r in reversed(left):
-        positions.append(r)
-        current = r
+    if up:
+        behind.reverse()
+    end = size - 1 if up else 0
+    if edges and last != end:
+        waypoints.append(len(positions))
+        positions.append(end)
+    positions.extend(behind)
+    return positions, waypoints, -direction
 
-    return SimulationResult("SCAN", positions, requests)
 
+def _simulate_sweep(name, requests, disk, backend, circular, edges, progress):
+    if vectorized.use_numpy(backend):
+        with phase(f"{name}.numpy"):
+            positions, waypoints = vectorized.sweep_positions(
+                requests, disk.head, disk.direction, disk.size, circular, edges
+            )
+    else:
+        with phase(f"{name}.sort"):
+            ordered = sorted(requests)
+        with phase(f"{name}.walk"):
+            positions, waypoints, _ = _sweep(
+                ordered, disk.head, disk.direction, disk.size, circular, edges,
+                presorted=True,
+            )
+    _done(progress, len(positions) - 1 - len(waypoints))
+    return SimulationResult(
+        name, positions, requests, waypoints, geometry=disk.geometry, backend=backend
+    )
 
-def simulate_cscan(requests, disk):
+
+def simulate_scan(requests, disk, backend="python", progress=None):
+    """
+    SCAN (Elevator) algorithm.
+    The head starts moving in disk.direction (1 = up, -1 = down).
+
+    Approach:
+    - Split requests into the ones ahead of the head and the ones
+      behind it (one sort).
+    - Serve 'ahead' in the direction of travel, continue to the end of
+      the disk (track size-1 moving up, 0 moving down), then reverse and
+      serve 'behind'.
+    - The edge is only visited if there is something left to serve after
+      reversing.
+
+    backend: 'python' or 'numpy' (falls back to 'python' without NumPy)
+    """
+    return _simulate_sweep(
+        "SCAN", requests, disk, backend, circular=False, edges=True, progress=progress
+    )
+
+
+def simulate_cscan(requests, disk, backend="python", progress=None):
     """
     C-SCAN (Circular SCAN) algorithm.
-    We assume the head moves in one direction (upwards), then jumps
-    back to the lowest request and continues upwards again.
+    The head services requests in one direction only (disk.direction).
+
+    Approach:
+    - Split into requests ahead of and behind the head (one sort).
+    - Serve 'ahead' in the direction of travel and continue to the end
+      of the disk, return to the other end (the return sweep counts as
+      head movement), then serve 'behind' in the same direction.
+
+    backend: 'python' or 'numpy' (falls back to 'python' without NumPy)
+    """
+    return _simulate_sweep(
+        "C-SCAN", requests, disk, backend, circular=True, edges=True, progress=progress
+    )
+
+
+def simulate_look(requests, disk, backend="python", progress=None):
+    """
+    LOOK algorithm.
+    Like SCAN, but the head reverses at the last request in the current
+    direction instead of travelling on to the edge of the disk.
+
+    backend: 'python' or 'numpy' (falls back to 'python' without NumPy)
+    """
+    return _simulate_sweep(
+        "LOOK", requests, disk, backend, circular=False, edges=False, progress=progress
+    )
+
+
+def simulate_clook(requests, disk, backend="python", progress=None):
+    """
+    C-LOOK algorithm.
+    Like C-SCAN, but after the last request in the direction of travel
+    the head jumps straight to the farthest request on the other side
+    (that jump is still counted as seek distance).
+
+    backend: 'python' or 'numpy' (falls back to 'python' without NumPy)
+    """
+    return _simulate_sweep(
+        "C-LOOK", requests, disk, backend, circular=True, edges=False, progress=progress
+    )
+
+
+def simulate_nstep_scan(requests, disk, step=10, backend="python", progress=None):
+    """
+    N-step SCAN.
+    The queue is cut, in arrival order, into batches of `step` requests.
+    Each batch is served completely with a SCAN sweep before the next
+    one is looked at, so a request can never be overtaken by more than
+    step-1 later arrivals. The head keeps its position and direction
+    from one batch to the next.
+
+    Runs in O(n log step). When requests is an iterator the progress
+    callback gets total=None. backend is accepted for a uniform signature;
+    the batches are always served with the pure-Python sweep.
+    """
+    if step < 1:
+        raise ValueError("step must be at least 1")
+
+    head, direction = disk.head, disk.direction
+    positions = array("q", [head])
+    waypoints = []
+    done = 0
+    total = len(requests) if hasattr(requests, "__len__") else None
+    source = iter(requests)
+    batches = 0
+    with phase("N-step SCAN.batches"):
+        while True:
+            batch = list(islice(source, step))
+            if not batch:
+                break
+            batches += 1
+            done += len(batch)
+            if progress is not None and done // PROGRESS_EVERY != (done - len(batch)) // PROGRESS_EVERY:
+                progress(done, total)
+            part, turns, direction = _sweep(
+                batch, head, direction, disk.size, circular=False, edges=True
+            )
+            offset = len(positions) - 1
+            waypoints.extend(i + offset for i in turns)
+            positions.extend(part[1:])
+            head = positions[-1]
+
+    count("N-step SCAN.batches", batches)
+    _done(progress, done)
+    return SimulationResult(
+        f"N-step SCAN (N={step})", positions, done, waypoints,
+        geometry=disk.geometry, backend=backend,
+    )
+
+
+def simulate_fscan(requests, disk, backend="python", progress=None):
+    """
+    FSCAN.
+    Two queues: the sweep in progress serves a frozen queue while new
+    arrivals collect in a second one, which is frozen in turn when the
+    sweep ends. With a static request list every request is already in
+    the first frozen queue, so the schedule is one SCAN over all of
+    them. (simulator.events has an FSCAN policy where arrivals over time
+    make the two queues differ.)
+
+    backend: 'python' or 'numpy' (falls back to 'python' without NumPy)
+    """
+    return _simulate_sweep(
+        "FSCAN", requests, disk, backend, circular=False, edges=True, progress=progress
+    )
+
+
+def _pending(links, i):
+    # Follow union-find links from i to their root, halving the path.
+    while links[i] != i:
+        links[i] = i = links[links[i]]
+    return i
+
+
+def simulate_sptf(requests, disk, sectors=None, backend="python", progress=None):
+    """
+    Shortest Positioning Time First (a.k.a. SATF).
+    Always serve the pending request that the head can start reading
+    soonest: seek time plus the rotational wait for its sector, both
+    taken from the drive geometry (disk.geometry, or a default
+    DriveGeometry for the disk size).
+
+    sectors: sector within the track for each request (same order as
+             requests). Without it the rotational position is unknown and
+             every request gets the expected half-revolution wait, which
+             makes the policy shortest-seek-time first.
 
     Approach:
-    - Split into left (requests < head) and right (requests >= head)
-    - Serve 'right' in ascending order,
-      then 'left' in ascending order (after a logical jump).
+    - Sort the requests by track once and find the head's place with
+      bisect. Served requests stay in the sorted list and are skipped
+      through union-find links to the nearest pending slot on each side
+      (with path halving), so removing one and stepping past served
+      ones are amortized near O(1) instead of an O(n) list.pop.
+    - Walk outward from the head, nearest track first. Seek time only
+      grows with distance, so once the seek plus the least possible
+      rotational wait (none with sectors, half a turn without) is longer
+      than the best positioning time found so far, nothing farther can
+      win and the walk stops. Without sectors that leaves only the
+      nearest track(s), so the run is O(n log n); with sectors the walk
+      covers every track within about one revolution of seek time, up
+      to O(n) per request on a large disk.
+    - Ties go to the request that came first in the request list.
+
+    The service times reported in the result are the exact ones used
+    for scheduling. backend is accepted for a uniform signature.
     """
-    current = disk.head
-    positions = [current]
+    geometry = disk.geometry or DriveGeometry(disk.size)
+    table = geometry.seek_table
+    half_turn = geometry.rotation_ms / 2
+    transfer = geometry.sector_ms
+
+    with phase("SPTF.sort"):
+        if sectors is None:
+            entries = sorted((r, 0, i) for i, r in enumerate(requests))
+        else:
+            entries = sorted((r, s, i) for i, (r, s) in enumerate(zip(requests, sectors)))
+        tracks = [e[0] for e in entries]
+
+    n = len(entries)
+    # after[i] leads to the first pending slot >= i (n: none); before[i]
+    # to the last pending slot < i, stored +1 (0: none).
+    after = list(range(n + 1))
+    before = list(range(n + 1))
+    floor = half_turn if sectors is None else 0.0
+
+    head = disk.head
+    now = 0.0
+    positions = array("q", [head])
+    times = array("d")
+    examined = 0
+
+    with phase("SPTF.select"):
+        for _ in range(n):
+            split = bisect_left(tracks, head)
+            hi = _pending(after, split)
+            lo = _pending(before, split) - 1
+            best = None  # (positioning time, request index, slot)
+            while lo >= 0 or hi < n:
+                if hi >= n or (lo >= 0 and head - tracks[lo] <= tracks[hi] - head):
+                    slot = lo
+                    lo = _pending(before, lo) - 1
+                else:
+                    slot = hi
+                    hi = _pending(after, hi + 1)
+                examined += 1
+                track, sector, index = entries[slot]
+                seek = table[abs(track - head)]
+                if best is not None and seek + floor > best[0]:
+                    break
+                if sectors is None:
+                    cost = seek + half_turn
+                else:
+                    cost = seek + geometry.rotational_wait(now + seek, sector)
+                if best is None or (cost, index) < best[:2]:
+                    best = (cost, index, slot)
+
+            cost, _, slot = best
+            after[slot] = slot + 1
+            before[slot + 1] = slot
+            track = tracks[slot]
+            positions.append(track)
+            times.append(cost + transfer)
+            now += cost + transfer
+            head = track
+            if progress is not None and len(times) % 1024 == 0:
+                progress(len(times), n)
 
-    left = sorted([r for r in requests if r < current])
-    right = sorted([r for r in requests if r >= current])
+    count("SPTF.decisions", len(times))
+    count("SPTF.candidates", examined)
+    _done(progress, len(times))
+    return SimulationResult(
+        "SPTF", positions, len(positions) - 1,
+        geometry=geometry, service_times=times, backend=backend,
+    )
 
-    # Move up and serve right side
-    for r in right:
-        positions.append(r)
-        current = r
 
-    # Logical jump to the lowest request (we don't add the jump itself
-    # as intermediate positions; only serviced requests are recorded)
-    for r in left:
-        positions.append(r)
-        current = r
+def _drain(scheduler, progress):
+    # Pop every queued request of an incremental scheduler, in order.
+    total = len(scheduler)
+    positions = array("q", [scheduler.head])
+    pop = scheduler.pop
+    for done in range(1, total + 1):
+        positions.append(pop()[0])
+        if progress is not None and done % PROGRESS_EVERY == 0:
+            progress(done, total)
+    count(f"{scheduler.name}.decisions", total)
+    _done(progress, total)
+    return positions
 
-    return SimulationResult("C-SCAN", positions, requests)
+
+def simulate_deadline(requests, disk, writes=None, read_expire=None, write_expire=None,
+                      fifo_batch=16, writes_starved=2, backend="python", progress=None):
+    """
+    Deadline (Linux mq-deadline style).
+    Requests are served in ascending track order, in batches of up to
+    fifo_batch reads or writes, but a batch starts at the oldest request
+    instead once that request has waited past its deadline, so no request
+    waits much longer than read_expire / write_expire. Reads are
+    preferred; writes get a batch after being passed over writes_starved
+    times.
+
+    writes: optional booleans, True where the request is a write (default:
+            all reads)
+    read_expire, write_expire: deadlines in tracks of head travel
+            (default two and ten full strokes)
+
+    All requests are queued up front, then dispatched one by one from
+    simulator.incremental.DeadlineScheduler, O(log n) per request.
+    backend is accepted for a uniform signature.
+    """
+    scheduler = DeadlineScheduler(disk, read_expire, write_expire, fifo_batch, writes_starved)
+    if hasattr(requests, "tolist"):
+        requests = requests.tolist()
+    with phase("Deadline.queue"):
+        add = scheduler.add
+        if writes is None:
+            for track in requests:
+                add(track)
+        else:
+            if hasattr(writes, "tolist"):
+                writes = writes.tolist()
+            for track, write in zip(requests, writes):
+                add(track, write=write)
+    with phase("Deadline.dispatch"):
+        positions = _drain(scheduler, progress)
+    return SimulationResult(
+        "Deadline", positions, len(positions) - 1, geometry=disk.geometry, backend=backend
+    )
+
+
+def simulate_bfq(requests, disk, processes=None, budget=16, weights=None,
+                 backend="python", progress=None):
+    """
+    Budget fair queueing (Linux BFQ style).
+    Each process has its own queue, served in ascending track order. One
+    process at a time gets the disk for up to `budget` requests; the next
+    one is picked by weighted fair queueing, so each process receives
+    service in proportion to its weight.
+
+    processes: the process (any hashable) of each request, same order as
+               requests (default: all from one process)
+    weights: optional dict process -> weight (default 1 each)
+
+    All requests are queued up front, then dispatched one by one from
+    simulator.incremental.BFQScheduler, O(log n) per request.
+    backend is accepted for a uniform signature.
+    """
+    scheduler = BFQScheduler(disk, budget, weights)
+    if hasattr(requests, "tolist"):
+        requests = requests.tolist()
+    with phase("BFQ.queue"):
+        add = scheduler.add
+        if processes is None:
+            for track in requests:
+                add(track)
+        else:
+            for track, process in zip(requests, processes):
+                add(track, process=process)
+    with phase("BFQ.dispatch"):
+        positions = _drain(scheduler, progress)
+    return SimulationResult(
+        "BFQ", positions, len(positions) - 1, geometry=disk.geometry, backend=backend
+    )
@@ -0,0 +1,151 @@
+"""
+Batch mode: many simulations in one process.
+
+    python run_sim.py batch jobs.jsonl > results.jsonl
+    produce_jobs | python run_sim.py batch
+
+Every non-blank input line is one JSON job and gets exactly one output
+line, its JSON result, in input order; blank lines are skipped, so the
+N-th result belongs to the N-th job (use "id" to match them up). Each
+result is written (and flushed) as soon as it is done, so a pipeline can
+stream jobs through a long-running process.
+
+Job fields (only a request source is required):
+  id             echoed back unchanged
+  algorithm      a simulator.registry name (default "fcfs")
+  requests       list of tracks, or
+  trace          trace path (with trace_format, trace_column,
+                 sectors_per_track, total_sectors as in run_sim.py), or
+  generate       {"kind": ..., "count": ..., "seed": ..., <kind options>}
+  disk_size, head, direction ("up"/"down" or 1/-1)
+  nstep, budget, sectors, writes, backend
+  processes      BFQ processes: a list (one per request) or a count of
+                 processes to spread the requests over round-robin
+  queue_depth    reorder only within a sliding queue of this many
+                 requests (simulator.window)
+  responses      true to add response percentiles (simulator.metrics)
+  positions      true to include every head position
+
+Result: {"id", "algorithm", "requests", "head", "steps", "total_seek",
+"average_seek", ..., "seconds"}, or {"id", "error"} if the job failed.
+
+Approach:
+- Interpreter startup, imports and the registry lookup are paid once per
+  process instead of once per simulation; algorithm modules stay loaded.
+- All jobs share one ResultCache, so repeated jobs are answered from it
+  (and, with a cache directory, from earlier batches too).
+- A failing job produces an error line and the batch carries on.
+"""
+
+import json
+import sys
+import time
+
+from . import registry
+from .cache import ResultCache
+from .disk import Disk
+from .metrics import summarize
+from .output import summary
+
+_DIRECTIONS = {"up": 1, "down": -1, 1: 1, -1: -1}
+
+
+def _requests(job, disk):
+    if "requests" in job:
+        requests = [int(r) for r in job["requests"]]
+        for req in requests:
+            if req < 0 or req >= disk.size:
+                raise ValueError(f"Request {req} out of disk range 0..{disk.size-1}")
+        return requests, None
+    if "trace" in job:
+        from .traces import load_trace
+
+        fmt = job.get("trace_format", "csv")
+        options = {"column": job.get("trace_column", 0)} if fmt == "csv" else {}
+        requests = load_trace(
+            job["trace"], fmt, disk,
+            sectors_per_track=job.get("sectors_per_track"),
+            total_sectors=job.get("total_sectors"),
+            **options,
+        )
+        return requests, None
+    if "generate" in job:
+        from .workloads import generate
+
+        spec = dict(job["generate"])
+        kind = spec.pop("kind")
+        count = spec.pop("count", 1000)
+        seed = spec.pop("seed", 0)
+        tracks, _, writes = generate(kind, count, disk.size, seed=seed, **spec)
+        return tracks.tolist(), writes
+    raise ValueError("job needs one of 'requests', 'trace' or 'generate'")
+
+
+def run_job(job, cache):
+    """Run one job (a dict, see above) and return its result dict."""
+    algorithm = job.get("algorithm", "fcfs")
+    sim_fn = registry.load(algorithm)
+    disk = Disk(
+        size=job.get("disk_size", 200),
+        head=job.get("head", 50),
+        direction=_DIRECTIONS[job.get("direction", "up")],
+    )
+    if not 0 <= disk.head < disk.size:
+        raise ValueError(f"Head position {disk.head} out of disk range 0..{disk.size-1}")
+    requests, writes = _requests(job, disk)
+
+    processes = job.get("processes")
+    if isinstance(processes, int):
+        processes = [i % processes for i in range(len(requests))] if processes > 1 else None
+    available = {
+        "backend": job.get("backend"),
+        "step": job.get("nstep"),
+        "budget": job.get("budget"),
+        "sectors": job.get("sectors"),
+        "writes": job.get("writes", writes),
+        "processes": processes,
+    }
+    options = registry.select_options(algorithm, available)
+    if job.get("queue_depth"):
+        from .window import simulate_window
+
+        sim_fn = simulate_window
+        options = {"policy": algorithm, "depth": job["queue_depth"],
+                   "step": job.get("nstep", 10), "writes": available["writes"],
+                   "processes": processes, "budget": job.get("budget", 16)}
+
+    start = time.perf_counter()
+    result = cache.run(sim_fn, requests, disk, **options)
+    info = summary(result, disk)
+    info["seconds"] = round(time.perf_counter() - start, 6)
+    if job.get("responses"):
+        info["responses"] = summarize(result.response_histogram())
+    if job.get("positions"):
+        info["positions"] = result.positions.tolist()
+    return info
+
+
+def run_batch(lines, out=sys.stdout, cache=None):
+    """
+    Run every JSON job line of `lines` (blank lines are skipped) and
+    write one JSON result line per job to out. Returns (jobs, failures).
+    """
+    cache = cache if cache is not None else ResultCache()
+    jobs = failures = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        jobs += 1
+        job_id = None
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("job must be a JSON object")
+            job_id = job.get("id")
+            info = run_job(job, cache)
+        except Exception as e:
+            failures += 1
+            info = {"error": f"{type(e).__name__}: {e}"}
+        out.write(json.dumps({"id": job_id, **info}) + "\n")
+        out.flush()
+    return jobs, failures
@@ -0,0 +1,214 @@
+"""
+Benchmark suite for the scheduling algorithms.
+
+    python -m simulator.bench
+    python -m simulator.bench --counts 1000,100000 --save-baseline bench.json
+    python -m simulator.bench --baseline bench.json --threshold 0.25
+
+Every algorithm is timed on every (distribution, request count) case.
+Each case is run --repeat times; the report shows the median run time,
+requests per second, p50/p90/p99 over the repeats and the peak traced
+memory of one extra run under tracemalloc (kept separate so tracing does
+not distort the timings).
+
+--save-baseline writes the results as JSON. --baseline compares the
+current run against such a file and exits with status 1 if any case's
+median time grew by more than --threshold (a fraction, 0.25 = 25%).
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from . import registry
+from .disk import Disk
+
+DEFAULT_COUNTS = (1_000, 10_000, 100_000)
+DISK_SIZE = 100_000
+
+
+def uniform(n, size, rng):
+    return [rng.randrange(size) for _ in range(n)]
+
+
+def clustered(n, size, rng, clusters=8, spread=0.01):
+    """Requests grouped around a few hot spots (Gaussian around each)."""
+    centers = [rng.randrange(size) for _ in range(clusters)]
+    sigma = max(1.0, size * spread)
+    out = []
+    for _ in range(n):
+        track = int(rng.gauss(rng.choice(centers), sigma))
+        out.append(min(size - 1, max(0, track)))
+    return out
+
+
+def sequential(n, size, rng, run=64):
+    """Runs of consecutive tracks starting at random offsets."""
+    out = []
+    track = rng.randrange(size)
+    for i in range(n):
+        if i % run == 0:
+            track = rng.randrange(size)
+        out.append(track)
+        track = (track + 1) % size
+    return out
+
+
+DISTRIBUTIONS = {
+    "uniform": uniform,
+    "clustered": clustered,
+    "sequential": sequential,
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_case(fn, requests, disk, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(requests, disk)
+        result.total_seek
+        times.append(time.perf_counter() - start)
+    times.sort()
+
+    tracemalloc.start()
+    try:
+        fn(requests, disk).total_seek
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = percentile(times, 50)
+    return {
+        "median_s": median,
+        "p50_s": median,
+        "p90_s": percentile(times, 90),
+        "p99_s": percentile(times, 99),
+        "ops_per_s": len(requests) / median if median else 0.0,
+        "peak_bytes": peak,
+    }
+
+
+def run_suite(algorithms, distributions, counts, repeat=5, seed=1, disk_size=DISK_SIZE):
+    """Return {case key: stats} for every combination."""
+    results = {}
+    for dist in distributions:
+        for n in counts:
+            requests = DISTRIBUTIONS[dist](n, disk_size, random.Random(seed))
+            disk = Disk(size=disk_size, head=disk_size // 2)
+            for name in algorithms:
+                key = f"{name}/{dist}/{n}"
+                results[key] = run_case(registry.load(name), requests, disk, repeat)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """List of (key, old, new, ratio) for cases slower than the threshold."""
+    regressions = []
+    for key, stats in results.items():
+        old = baseline.get(key)
+        if not old or not old.get("median_s"):
+            continue
+        ratio = stats["median_s"] / old["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append((key, old["median_s"], stats["median_s"], ratio))
+    return regressions
+
+
+def print_report(results, out=sys.stdout):
+    header = (f"{'case':<28} {'median ms':>10} {'p90 ms':>9} {'p99 ms':>9} "
+              f"{'req/s':>12} {'peak KiB':>10}")
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for key, s in results.items():
+        print(f"{key:<28} {s['median_s'] * 1e3:>10.2f} {s['p90_s'] * 1e3:>9.2f} "
+              f"{s['p99_s'] * 1e3:>9.2f} {s['ops_per_s']:>12,.0f} "
+              f"{s['peak_bytes'] / 1024:>10.1f}", file=out)
+
+
+def _names(value, known):
+    names = [x.strip() for x in value.split(",") if x.strip()]
+    for name in names:
+        if name not in known:
+            raise argparse.ArgumentTypeError(f"unknown name {name!r}, expected one of {list(known)}")
+    return names
+
+
+def main(argv=None):
+    # Plugins register their algorithms before --algorithms is validated.
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument("--plugin", action="append", default=[])
+    registry.load_plugins(pre.parse_known_args(argv)[0].plugin)
+
+    parser = argparse.ArgumentParser(
+        prog="python -m simulator.bench",
+        description="Benchmark the disk scheduling algorithms",
+    )
+    parser.add_argument(
+        "--algorithms", "-a", type=lambda v: _names(v, registry.names()),
+        default=list(registry.names(default_only=True)),
+        help="Comma-separated algorithms (default: all but sptf)",
+    )
+    parser.add_argument(
+        "--plugin", action="append", default=[], metavar="MODULE",
+        help="Import MODULE first so the algorithms it registers can be benchmarked",
+    )
+    parser.add_argument(
+        "--distributions", type=lambda v: _names(v, DISTRIBUTIONS),
+        default=list(DISTRIBUTIONS), help="Comma-separated request distributions",
+    )
+    parser.add_argument(
+        "--counts", "-n", type=lambda v: [int(x) for x in v.split(",") if x.strip()],
+        default=list(DEFAULT_COUNTS), help="Comma-separated request counts",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--disk-size", "-d", type=int, default=DISK_SIZE)
+    parser.add_argument("--save-baseline", type=str, default=None,
+                        help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="Compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.algorithms, args.distributions, args.counts,
+                        repeat=args.repeat, seed=args.seed, disk_size=args.disk_size)
+    print_report(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for key, old, new, ratio in regressions:
+                print(f"  {key}: {old * 1e3:.2f} ms -> {new * 1e3:.2f} ms ({ratio:.2f}x)")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
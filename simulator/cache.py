@@ -0,0 +1,203 @@
+"""
+Memoized simulation results.
+
+ResultCache sits in front of the simulate_* functions:
+
+    cache = ResultCache(max_entries=32, max_bytes=512 << 20, directory=".simcache")
+    result = cache.run(simulate_sstf, requests, disk)
+
+Results are keyed by a fingerprint of the request array (a BLAKE2 hash
+of its int64 bytes), the disk parameters, the algorithm and its options.
+In memory the cache is an LRU bounded both by entry count and by the
+approximate size of the stored results. With a directory, results are
+also pickled to disk, so re-running the same trace in a new process only
+costs the hash and the unpickle.
+
+Every key is salted with CACHE_VERSION, so results stored by an older
+version of the simulator are never returned after a change that affects
+them: bump it whenever an algorithm's output or SimulationResult changes.
+
+Unpickling can run arbitrary code, so the cache directory must be
+trusted: only point it at a directory that nobody else can write to.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+
+CACHE_VERSION = 2
+
+CacheStats = namedtuple(
+    "CacheStats",
+    ["hits", "disk_hits", "misses", "evictions", "entries", "bytes"],
+)
+
+
+def _request_bytes(requests):
+    if isinstance(requests, array) and requests.typecode == "q":
+        return memoryview(requests).cast("B")
+    if hasattr(requests, "dtype"):
+        return memoryview(requests.astype("int64", copy=False)).cast("B")
+    return memoryview(array("q", requests)).cast("B")
+
+
+def _option_bytes(value):
+    # Per-request sequences (sectors, write flags, processes) are hashed
+    # by content: repr() abbreviates long NumPy arrays.
+    if isinstance(value, (list, tuple, array)) or hasattr(value, "dtype"):
+        try:
+            return bytes(_request_bytes(value))
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return repr(value).encode()
+
+
+def fingerprint(sim_fn, requests, disk, options=None):
+    """Hex digest identifying one simulation run."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"v{CACHE_VERSION}:".encode())
+    h.update(f"{sim_fn.__module__}.{sim_fn.__qualname__}".encode())
+    h.update(repr((disk.size, disk.head, disk.direction)).encode())
+    geometry = disk.geometry
+    if geometry is not None:
+        h.update(repr((
+            geometry.cylinders, geometry.sectors_per_track, geometry.rpm,
+            geometry.settle_ms, geometry.full_seek_ms, geometry.seek_profile,
+        )).encode())
+    for name, value in sorted((options or {}).items()):
+        data = _option_bytes(value)
+        h.update(f"{name}:{len(data)}:".encode())
+        h.update(data)
+    data = _request_bytes(requests)
+    h.update(len(data).to_bytes(8, "little"))
+    h.update(data)
+    return h.hexdigest()
+
+
+def result_size(result):
+    """Approximate bytes held by a SimulationResult."""
+    size = 256
+    for name in ("positions", "_seek_distances", "_service_times"):
+        value = getattr(result, name, None)
+        if value is None:
+            continue
+        if hasattr(value, "nbytes"):
+            size += value.nbytes
+        elif isinstance(value, array):
+            size += value.itemsize * len(value)
+    return size
+
+
+class ResultCache:
+    def __init__(self, max_entries=64, max_bytes=256 << 20, directory=None):
+        """
+        max_entries: most results kept in memory
+        max_bytes: most (approximate) result bytes kept in memory
+        directory: if set, results are also stored there as pickles and
+                   looked up on a memory miss. The pickles are loaded
+                   as they are, so this must be a trusted directory.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._entries = OrderedDict()  # key -> (result, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self.hits, self.disk_hits, self.misses,
+                              self.evictions, len(self._entries), self._bytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def run(self, sim_fn, requests, disk, progress=None, **options):
+        """
+        Return sim_fn(requests, disk, **options), from the cache if this
+        exact run has been seen before. progress is passed through on a
+        miss and not part of the key.
+        """
+        key = fingerprint(sim_fn, requests, disk, options)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        result = sim_fn(requests, disk, progress=progress, **options)
+        self.put(key, result)
+        return result
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        result = self._load(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._insert(key, result)
+        return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._insert(key, result)
+        self._store(key, result)
+
+    def _insert(self, key, result):
+        size = result_size(result)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (result, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _store(self, key, result):
+        if not self.directory:
+            return
+        # Write to a temporary file first so a crash never leaves a
+        # half-written pickle under the real name.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
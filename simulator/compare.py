@@ -0,0 +1,170 @@
+"""
+Run several scheduling policies on one workload, side by side.
+
+    comparison = compare(requests, disk)
+    print_table(comparison)
+
+Approach:
+- The expensive part of most policies is the same: sorting the queue.
+  compare() sorts the requests once and keeps that ordered list as a
+  shared index.
+- SCAN, C-SCAN, LOOK, C-LOOK and FSCAN split the shared ordered list at
+  the head instead of sorting again (_sweep with presorted=True).
+- SSTF takes its distinct sorted tracks straight from the ordered list
+  (one linear pass) and runs the usual two-pointer walk on them.
+- FCFS needs no index. Every other registered policy (N-step SCAN sorts
+  each batch of N requests on its own, SPTF needs per-request sectors,
+  Deadline and BFQ dispatch from their incremental queues, and plugin
+  policies) runs as usual through simulator.registry.
+
+Each row reports total/average seek and the time spent on that policy;
+the shared sort is timed once, separately, as index_seconds. With
+responses=True rows also carry response percentiles (simulator.metrics),
+so tail latency and starvation can be compared too.
+"""
+
+import sys
+import time
+from array import array
+from collections import namedtuple
+from itertools import groupby
+
+from . import registry
+from .algorithms import _sstf_index, _sstf_walk, _sweep, simulate_fcfs
+from .disk import SimulationResult
+from .metrics import summarize
+from .window import simulate_window
+
+# name -> (result name, circular, edges) for the sweep family
+_SWEEPS = {
+    "scan": ("SCAN", False, True),
+    "cscan": ("C-SCAN", True, True),
+    "look": ("LOOK", False, False),
+    "clook": ("C-LOOK", True, False),
+    "fscan": ("FSCAN", False, True),
+}
+
+CompareRow = namedtuple(
+    "CompareRow",
+    ["algorithm", "requests", "total_seek", "average_seek", "seconds", "result",
+     "responses"],
+)
+Comparison = namedtuple("Comparison", ["rows", "index_seconds"])
+
+
+class _SharedIndex:
+    """The request list sorted once, plus what SSTF derives from it."""
+
+    def __init__(self, requests):
+        self.requests = requests
+        self.ordered = sorted(requests)
+        self._sstf = None
+
+    def sstf(self):
+        # (distinct sorted tracks, count per track, first index per track)
+        if self._sstf is None:
+            counts, first_index = _sstf_index(self.requests)
+            tracks = [t for t, _ in groupby(self.ordered)]
+            self._sstf = (tracks, counts, first_index)
+        return self._sstf
+
+
+def _run(name, requests, index, disk, options):
+    if name == "fcfs":
+        return simulate_fcfs(requests, disk)
+    if name == "sstf":
+        tracks, counts, first_index = index.sstf()
+        positions = array("q", [disk.head])
+        positions.extend(_sstf_walk(tracks, counts, first_index, disk.head, len(requests)))
+        return SimulationResult("SSTF", positions, requests, geometry=disk.geometry)
+
+    if name not in _SWEEPS:
+        return registry.load(name)(requests, disk, **registry.select_options(name, options))
+
+    label, circular, edges = _SWEEPS[name]
+    positions, waypoints, _ = _sweep(
+        index.ordered, disk.head, disk.direction, disk.size,
+        circular, edges, presorted=True,
+    )
+    return SimulationResult(label, positions, requests, waypoints, geometry=disk.geometry)
+
+
+def compare(requests, disk, algorithms=None, step=10, sectors=None,
+            responses=False, writes=None, processes=None, depth=None):
+    """
+    Run every policy in `algorithms` on the same requests and disk.
+
+    requests: track numbers (list, array('q') or NumPy array)
+    algorithms: simulator.registry names, in the order the rows should
+                appear (default: registry.names(default_only=True))
+    step: batch size for N-step SCAN
+    sectors: per-request sectors for SPTF (see simulate_sptf)
+    writes: per-request write flags for Deadline (see simulate_deadline)
+    processes: per-request processes for BFQ (see simulate_bfq)
+    depth: if set, every policy only reorders within a sliding queue of
+           this many requests (simulator.window; no shared sort, and
+           only simulator.window.POLICIES are available)
+    responses: also summarize per-request response (p50/p95/p99/max and
+               starvation, see simulator.metrics) into each row; this is
+               not included in the row's time
+
+    Returns a Comparison: rows (one CompareRow per policy, each carrying
+    its SimulationResult) and index_seconds, the time of the shared sort.
+    """
+    if algorithms is None:
+        algorithms = registry.names(default_only=True)
+    for name in algorithms:
+        registry.policy(name)  # ValueError if unknown
+
+    # Plain ints sort much faster than array/NumPy scalars.
+    if hasattr(requests, "tolist"):
+        requests = requests.tolist()
+
+    index = None
+    index_seconds = 0.0
+    if depth is None:
+        start = time.perf_counter()
+        index = _SharedIndex(requests)
+        index_seconds = time.perf_counter() - start
+
+    options = {"step": step, "sectors": sectors, "writes": writes, "processes": processes}
+    rows = []
+    for name in algorithms:
+        start = time.perf_counter()
+        if depth is None:
+            result = _run(name, requests, index, disk, options)
+        else:
+            result = simulate_window(requests, disk, name, depth, step,
+                                     writes=writes, processes=processes)
+        total = result.total_seek
+        seconds = time.perf_counter() - start
+        summary = summarize(result.response_histogram()) if responses else None
+        rows.append(CompareRow(
+            result.algorithm_name, result.num_requests, total,
+            result.average_seek, seconds, result, summary,
+        ))
+    return Comparison(rows, index_seconds)
+
+
+def print_table(comparison, out=sys.stdout):
+    """Side-by-side table of a Comparison, best total seek marked with *."""
+    from tabulate import tabulate
+
+    rows = comparison.rows
+    best = min((r.total_seek for r in rows), default=None)
+    with_responses = any(r.responses for r in rows)
+    headers = ["Algorithm", "Total seek", "Average seek", "Time ms"]
+    if with_responses:
+        headers += ["p50 resp", "p99 resp", "max resp", "starved"]
+    table = []
+    for r in rows:
+        mark = " *" if r.total_seek == best else ""
+        line = [r.algorithm + mark, r.total_seek, r.average_seek, r.seconds * 1e3]
+        if with_responses:
+            info = r.responses
+            line += [info["p50"], info["p99"], info["max"], info["starved"]]
+        table.append(line)
+    print(tabulate(table, headers=headers, tablefmt="github", floatfmt=".2f"), file=out)
+    if comparison.index_seconds:
+        print(f"\nShared sort: {comparison.index_seconds * 1e3:.2f} ms "
+              f"(included once, not in the per-policy times)", file=out)
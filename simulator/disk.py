@@ -1,33 +1,252 @@
+import math
+from array import array
+from itertools import islice
+
+from . import metrics, vectorized
+from .instrument import phase
+
+
+class DriveGeometry:
+    SEEK_PROFILES = ("sqrt", "linear")
+
+    def __init__(self, cylinders, sectors_per_track=63, rpm=7200,
+                 settle_ms=1.0, full_seek_ms=15.0, seek_profile="sqrt"):
+        """
+        Physical timing model of a drive.
+
+        cylinders: number of tracks (normally the Disk size)
+        sectors_per_track: sectors on each track
+        rpm: spindle speed
+        settle_ms: time of the shortest non-zero seek (head settle)
+        full_seek_ms: time of a seek across the whole disk
+        seek_profile: how seek time grows with distance between the two:
+            'sqrt'   settle + k * sqrt(d)   (acceleration-limited, typical)
+            'linear' settle + k * d
+
+        Seek times for every distance are precomputed into seek_table,
+        so scheduling loops only do a list lookup per candidate.
+        """
+        if seek_profile not in self.SEEK_PROFILES:
+            raise ValueError(f"Unknown seek profile {seek_profile!r}")
+        self.cylinders = cylinders
+        self.sectors_per_track = sectors_per_track
+        self.rpm = rpm
+        self.settle_ms = settle_ms
+        self.full_seek_ms = full_seek_ms
+        self.seek_profile = seek_profile
+
+        self.rotation_ms = 60000.0 / rpm
+        self.sector_ms = self.rotation_ms / sectors_per_track
+        self.seek_table = self._build_seek_table()
+
+    def _build_seek_table(self):
+        span = max(1, self.cylinders - 1)
+        extra = self.full_seek_ms - self.settle_ms
+        shape = math.sqrt if self.seek_profile == "sqrt" else (lambda x: x)
+        table = [0.0]
+        table.extend(self.settle_ms + extra * shape(d / span)
+                     for d in range(1, max(1, self.cylinders)))
+        return table
+
+    def seek_time(self, distance):
+        return self.seek_table[distance]
+
+    def rotational_wait(self, now, sector):
+        """
+        Time until `sector` passes under the head, if the platter was at
+        sector 0 at time 0 and the head is on the right track at `now`.
+        """
+        angle = (now / self.sector_ms) % self.sectors_per_track
+        return ((sector - angle) % self.sectors_per_track) * self.sector_ms
+
+    def service_times(self, positions, waypoints=(), sectors=None):
+        """
+        Service time in ms of every step of a schedule.
+
+        A step is the seek from the previous position, then the rotational
+        wait for the request's sector and one sector of transfer. Steps
+        that end on a waypoint are pure travel (seek only).
+        sectors: sector of each serviced request, in service order. When
+                 unknown (None), the expected wait of half a revolution
+                 is used instead.
+        """
+        table = self.seek_table
+        half_turn = self.rotation_ms / 2
+        skip = set(waypoints)
+        sector_iter = iter(sectors) if sectors is not None else None
+        times = array("d")
+        now = 0.0
+        prev = None
+        for i, pos in enumerate(positions):
+            if prev is None:
+                prev = pos
+                continue
+            step = table[abs(pos - prev)]
+            if i not in skip:
+                if sector_iter is None:
+                    step += half_turn
+                else:
+                    step += self.rotational_wait(now + step, next(sector_iter))
+                step += self.sector_ms
+            times.append(step)
+            now += step
+            prev = pos
+        return times
+
+
 class Disk:
-    def __init__(self, size, head=0, direction=1):
+    def __init__(self, size, head=0, direction=1, geometry=None):
         """
         size: total number of tracks (0 to size-1)
         head: starting head position
         direction: 1 for increasing, -1 for decreasing (for SCAN/C-SCAN)
+        geometry: optional DriveGeometry; when set, results also report
+                  service time in milliseconds. It needs at least `size`
+                  cylinders, since seek times are looked up by distance.
         """
+        if geometry is not None and geometry.cylinders < size:
+            raise ValueError(
+                f"Drive geometry has {geometry.cylinders} cylinders, "
+                f"fewer than the {size} tracks of the disk"
+            )
         self.size = size
         self.head = head
         self.direction = direction
+        self.geometry = geometry
+
+
+def _as_positions(positions):
+    """
+    Store positions compactly: 8 bytes per step in an array('q') instead
+    of a list of boxed ints. Arrays that are already compact (array('q')
+    or a NumPy int array) are kept as they are, without a copy.
+    """
+    if isinstance(positions, array) and positions.typecode == "q":
+        return positions
+    if hasattr(positions, "dtype"):
+        return positions
+    return array("q", positions)
+
+
+def _vectorize(positions, backend):
+    """
+    Use NumPy for positions that already are an ndarray, or for long ones
+    when the result was produced with the numpy backend.
+    """
+    if hasattr(positions, "dtype"):
+        return True
+    return backend == "numpy" and vectorized.worthwhile(len(positions))
 
 
 class SimulationResult:
-    def __init__(self, algorithm_name, positions, requests):
+    __slots__ = (
+        "algorithm_name",
+        "positions",
+        "num_requests",
+        "waypoints",
+        "geometry",
+        "backend",
+        "_seek_distances",
+        "_total_seek",
+        "_service_times",
+    )
+
+    def __init__(self, algorithm_name, positions, requests, waypoints=(),
+                 geometry=None, service_times=None, backend="python"):
         """
         algorithm_name: str, e.g., 'FCFS'
-        positions: list of head positions visited, including starting head
-        requests: original request list (for reference)
+        positions: head positions visited, including starting head
+                   (any sequence of ints; stored as array('q'))
+        requests: original request list, or just the number of requests.
+                  Only the count is kept, not a reference to the list.
+        waypoints: indices into positions that the head only travels
+                   through without servicing a request (e.g. the disk
+                   edge SCAN turns at). Their seek still counts.
+        geometry: DriveGeometry used to derive service times (optional)
+        service_times: per-step service times in ms, if the algorithm
+                       already knows them exactly (e.g. SPTF)
+        backend: the backend the algorithm ran with, 'python' or 'numpy'
+
+        seek_distances, total_seek, average_seek and the service-time
+        metrics are computed on first access; total_seek is a single pass
+        over positions and does not build the per-step list. With NumPy
+        installed, long results of the numpy backend (and positions that
+        already are a NumPy array) compute both with np.abs(np.diff(...))
+        on a zero-copy view of the positions; the python backend stays
+        pure Python (see vectorized.worthwhile).
         """
         self.algorithm_name = algorithm_name
-        self.positions = positions
-        self.requests = requests
-        self.seek_distances = self._compute_seek_distances()
-        self.total_seek = sum(self.seek_distances)
-        self.average_seek = (
-            self.total_seek / len(requests) if requests else 0
-        )
+        with phase("result.init"):
+            self.positions = _as_positions(positions)
+        self.num_requests = requests if isinstance(requests, int) else len(requests)
+        self.waypoints = tuple(waypoints)
+        self.geometry = geometry
+        self.backend = backend
+        self._seek_distances = None
+        self._total_seek = None
+        self._service_times = service_times
+
+    @property
+    def seek_distances(self):
+        if self._seek_distances is None:
+            with phase("result.seek_distances"):
+                self._seek_distances = self._compute_seek_distances()
+        return self._seek_distances
+
+    @property
+    def total_seek(self):
+        if self._total_seek is None:
+            with phase("result.total_seek"):
+                if _vectorize(self.positions, self.backend):
+                    self._total_seek = int(vectorized.seek_distances(self.positions).sum())
+                elif self._seek_distances is not None:
+                    self._total_seek = sum(self._seek_distances)
+                else:
+                    p = self.positions
+                    self._total_seek = sum(
+                        abs(b - a) for a, b in zip(p, islice(p, 1, None))
+                    )
+        return self._total_seek
+
+    @property
+    def average_seek(self):
+        return self.total_seek / self.num_requests if self.num_requests else 0
+
+    @property
+    def service_times(self):
+        """Per-step service time in ms, or None without a drive geometry."""
+        if self._service_times is None and self.geometry is not None:
+            with phase("result.service_times"):
+                self._service_times = self.geometry.service_times(self.positions, self.waypoints)
+        return self._service_times
+
+    @property
+    def total_service_ms(self):
+        times = self.service_times
+        return None if times is None else sum(times)
+
+    @property
+    def average_service_ms(self):
+        total = self.total_service_ms
+        if total is None:
+            return None
+        return total / self.num_requests if self.num_requests else 0
+
+    def response_histogram(self, unit="seek"):
+        """
+        Histogram of per-request response (cumulative seek, or ms with
+        unit='ms') -- see simulator.metrics.
+        """
+        return metrics.response_histogram(self, unit)
 
     def _compute_seek_distances(self):
-        if len(self.positions) < 2:
-            return []
-        return [abs(self.positions[i] - self.positions[i - 1])
-                for i in range(1, len(self.positions))]
+        p = self.positions
+        if len(p) < 2:
+            return array("q")
+        if _vectorize(p, self.backend):
+            distances = vectorized.seek_distances(p)
+            if isinstance(p, array):
+                # Keep the container type the caller gave us.
+                return array("q", distances.tobytes())
+            return distances
+        return array("q", (abs(b - a) for a, b in zip(p, islice(p, 1, None))))
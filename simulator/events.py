@@ -0,0 +1,120 @@
+"""
+Time-based (discrete-event) simulation.
+
+The batch simulate_* functions see the whole request list up front. Here
+requests arrive over time instead: each one carries an arrival timestamp,
+the head moves at a fixed seek speed, and the scheduling policy only ever
+chooses among the requests that have already arrived and are still
+pending.
+
+Events (arrivals and completions) are kept in a heap ordered by time.
+Arrivals are pulled from the input iterator one at a time, so only the
+next arrival and the currently pending requests are held in memory; the
+serviced requests are yielded as ServiceEvent tuples and never stored.
+"""
+
+import heapq
+from collections import namedtuple
+
+from .incremental import SCHEDULERS, make_scheduler
+
+POLICIES = tuple(SCHEDULERS)
+
+# Event kinds. Arrivals sort before completions at the same timestamp so
+# that a request arriving exactly when the head frees up is visible to
+# the scheduler for that decision.
+_ARRIVAL = 0
+_COMPLETION = 1
+
+ServiceEvent = namedtuple(
+    "ServiceEvent",
+    ["index", "track", "arrival", "start", "finish", "seek"],
+)
+ServiceEvent.__doc__ = """
+One serviced request.
+index: position of the request in the arrival stream
+track: track number
+arrival, start, finish: timestamps (start = when the head began moving to it)
+seek: tracks travelled to reach it (including any edge travel before it)
+"""
+
+
+def uniform_arrivals(requests, interval):
+    """
+    Attach evenly spaced arrival times to a plain request sequence:
+    request i arrives at i * interval.
+    """
+    for i, track in enumerate(requests):
+        yield i * interval, track
+
+
+def simulate_events(arrivals, disk, policy="fcfs", seek_speed=1.0, transfer_time=0.0,
+                    step=10):
+    """
+    Event-driven simulation over a stream of timed requests.
+
+    arrivals: iterable of (arrival_time, track) pairs in non-decreasing
+              arrival order (see uniform_arrivals for plain lists)
+    disk: Disk object (head and direction are the starting state)
+    policy: one of POLICIES
+    seek_speed: tracks travelled per time unit
+    transfer_time: fixed time spent at the track once the head arrives
+    step: batch size for the 'nstep' policy
+
+    Yields a ServiceEvent for every request, in service order. Nothing is
+    accumulated, so traces of any length stream through in memory
+    proportional to the number of requests pending at once.
+
+    Approach:
+    - Keep a heap of (time, kind, seq) events; only the next arrival from
+      the input is ever in it, plus at most one completion.
+    - On an arrival, add the request to the policy's incremental
+      scheduler (simulator.incremental).
+    - Whenever the head is idle and something is pending, ask the policy
+      for the next request and schedule its completion after the seek
+      and transfer time.
+    """
+    if seek_speed <= 0:
+        raise ValueError("seek_speed must be positive")
+
+    pending = make_scheduler(policy, disk, step)
+    source = iter(arrivals)
+    events = []
+    busy = None  # (track, seq, arrival, start, seek) of the request in service
+    last_arrival = None
+    seq = 0
+
+    def push_next_arrival():
+        nonlocal seq, last_arrival
+        for arrival, track in source:
+            if not 0 <= track < disk.size:
+                raise ValueError(f"Request {track} out of disk range 0..{disk.size-1}")
+            if last_arrival is not None and arrival < last_arrival:
+                raise ValueError("arrivals must be sorted by arrival time")
+            last_arrival = arrival
+            heapq.heappush(events, (arrival, _ARRIVAL, seq, track))
+            seq += 1
+            return
+
+    push_next_arrival()
+    while events:
+        now, kind, index, track = heapq.heappop(events)
+
+        if kind == _ARRIVAL:
+            pending.add(track, (index, now))
+            push_next_arrival()
+        else:
+            track, index, arrival, start, seek = busy
+            busy = None
+            yield ServiceEvent(index, track, arrival, start, now, seek)
+
+        # Let every arrival with the same timestamp reach the queue before
+        # the policy makes its choice.
+        if events and events[0][0] == now and events[0][1] == _ARRIVAL:
+            continue
+
+        if busy is None and pending:
+            track, _, (index, arrival), seek = pending.pop()
+            finish = now + seek / seek_speed + transfer_time
+            busy = (track, index, arrival, now, seek)
+            heapq.heappush(events, (finish, _COMPLETION, index, track))
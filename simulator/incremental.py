@@ -0,0 +1,712 @@
+"""
+Incremental (stateful) schedulers.
+
+The simulate_* functions compute a whole schedule from a fixed list. The
+schedulers here keep a live queue instead: requests are added and
+cancelled one at a time and next() services whichever request the policy
+picks now.
+
+    sched = SSTFScheduler(disk)
+    sched.add(82)
+    sched.add(170)
+    sched.cancel(170)
+    track = sched.next()
+
+Approach:
+- Pending requests live in heaps split around the head (below / above it,
+  or this sweep / next sweep for the circular policies), so the next
+  request is always at the top of one heap: add() and next() are
+  O(log n) and nothing is ever re-sorted.
+- cancel() is lazy: the request is remembered as cancelled and dropped
+  when it reaches the top of its heap. When cancelled entries outnumber
+  the live ones the heaps are rebuilt without them, so memory stays
+  proportional to the pending queue.
+
+Fed the same requests up front, every scheduler services them in the
+same order as the matching batch function.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from collections import deque
+
+
+class _Scheduler:
+    name = None
+
+    def __init__(self, disk):
+        self.head = disk.head
+        self.direction = 1 if disk.direction >= 0 else -1
+        self.size = disk.size
+        self.total_seek = 0
+        self.via = ()  # disk edges the head passed on the way to the last pop
+        self._seq = 0
+        self._live = 0
+        # track -> seq of its one pending request, or a list of seqs
+        # (oldest first) when it has several
+        self._pending = {}
+        self._cancelled = set()
+
+    def __len__(self):
+        return self._live
+
+    def __contains__(self, track):
+        return track in self._pending
+
+    def add(self, track, data=None):
+        """
+        Queue a request for `track`. data is returned with it by pop().
+        Returns the request's sequence number (0, 1, 2, ... in add order).
+        """
+        if not 0 <= track < self.size:
+            raise ValueError(f"Request {track} out of disk range 0..{self.size-1}")
+        seq = self._seq
+        self._seq += 1
+        pending = self._pending
+        seqs = pending.get(track)
+        if seqs is None:
+            pending[track] = seq
+        elif type(seqs) is int:
+            pending[track] = [seqs, seq]
+        else:
+            seqs.append(seq)
+        self._live += 1
+        self._push(track, seq, data)
+        return seq
+
+    def cancel(self, track):
+        """
+        Withdraw the oldest pending request for `track` and return its
+        sequence number. Raises KeyError if nothing is pending there.
+        """
+        seqs = self._seqs(track)
+        if not seqs:
+            raise KeyError(track)
+        seq = seqs[0]
+        self._forget(track, seq)
+        self._cancelled.add(seq)
+        self._live -= 1
+        if len(self._cancelled) > max(64, self._live):
+            self._compact(lambda entry: entry[1] not in self._cancelled)
+            self._cancelled.clear()
+        return seq
+
+    def pop(self):
+        """
+        Service the next request. Returns (track, seq, data, seek), where
+        seek includes any travel to a disk edge on the way.
+        """
+        if not self._live:
+            raise IndexError("pop from an empty scheduler")
+        self.via = ()
+        track, seq, data, seek = self._take()
+        self._forget(track, seq)
+        self._live -= 1
+        self.head = track
+        self.total_seek += seek
+        return track, seq, data, seek
+
+    def next(self):
+        """Move the head to the next request and return its track."""
+        return self.pop()[0]
+
+    def _seqs(self, track):
+        # Pending seqs at track, oldest first.
+        seqs = self._pending.get(track, ())
+        return (seqs,) if type(seqs) is int else seqs
+
+    def _forget(self, track, seq):
+        pending = self._pending
+        seqs = pending[track]
+        if type(seqs) is int:
+            del pending[track]
+            return
+        if seqs[0] == seq:
+            del seqs[0]
+        else:
+            seqs.remove(seq)
+        if len(seqs) == 1:
+            pending[track] = seqs[0]
+
+    def _clean(self, heap):
+        # Drop cancelled entries from the top of a heap, then return it.
+        cancelled = self._cancelled
+        while heap and heap[0][1] in cancelled:
+            cancelled.discard(heapq.heappop(heap)[1])
+        return heap
+
+    def _push(self, track, seq, data):
+        raise NotImplementedError
+
+    def _take(self):
+        raise NotImplementedError
+
+    def _compact(self, keep):
+        raise NotImplementedError
+
+
+def _filter_heap(heap, keep):
+    heap[:] = [entry for entry in heap if keep(entry)]
+    heapq.heapify(heap)
+
+
+class FCFSScheduler(_Scheduler):
+    name = "FCFS"
+
+    def __init__(self, disk):
+        super().__init__(disk)
+        self._items = deque()
+
+    def _push(self, track, seq, data):
+        self._items.append((track, seq, data))
+
+    def _take(self):
+        items, cancelled = self._items, self._cancelled
+        while items[0][1] in cancelled:
+            cancelled.discard(items.popleft()[1])
+        track, seq, data = items.popleft()
+        return track, seq, data, abs(track - self.head)
+
+    def _compact(self, keep):
+        self._items = deque(entry for entry in self._items if keep(entry))
+
+
+class SSTFScheduler(_Scheduler):
+    """
+    Pending requests split around the head:
+      up   = min-heap of tracks >= head
+      down = max-heap (negated) of tracks < head
+    The nearest request is at the top of one of the two heaps. Moving the
+    head to that request keeps the split valid. Ties go to the request
+    that was added first.
+    """
+
+    name = "SSTF"
+
+    def __init__(self, disk):
+        super().__init__(disk)
+        self._up = []
+        self._down = []
+
+    def _push(self, track, seq, data):
+        if track >= self.head:
+            heapq.heappush(self._up, (track, seq, data))
+        else:
+            heapq.heappush(self._down, (-track, seq, data))
+
+    def _take(self):
+        head = self.head
+        up = self._clean(self._up)
+        down = self._clean(self._down)
+        if not down:
+            take_up = True
+        elif not up:
+            take_up = False
+        else:
+            d_up = up[0][0] - head
+            d_down = head + down[0][0]
+            take_up = d_up < d_down or (d_up == d_down and up[0][1] < down[0][1])
+
+        if take_up:
+            track, seq, data = heapq.heappop(up)
+        else:
+            neg, seq, data = heapq.heappop(down)
+            track = -neg
+        return track, seq, data, abs(track - head)
+
+    def _compact(self, keep):
+        _filter_heap(self._up, keep)
+        _filter_heap(self._down, keep)
+
+
+class SCANScheduler(_Scheduler):
+    """
+    Elevator order: keep moving in the current direction while there is
+    anything ahead of the head, then reverse. Uses the same up/down heap
+    split as SSTFScheduler.
+
+    SCAN travels on to the disk edge before reversing and adds that
+    travel to the seek of the next request; LOOK reverses at the last
+    request.
+    """
+
+    name = "SCAN"
+    edges = True
+
+    def __init__(self, disk):
+        super().__init__(disk)
+        self._up = []
+        self._down = []
+
+    def _push(self, track, seq, data):
+        if track > self.head or (track == self.head and self.direction > 0):
+            heapq.heappush(self._up, (track, seq, data))
+        else:
+            heapq.heappush(self._down, (-track, seq, data))
+
+    def _take(self):
+        head = self.head
+        travel = 0
+        if self.direction > 0 and not self._clean(self._up):
+            self.direction = -1
+            if self.edges:
+                travel, head = self.size - 1 - head, self.size - 1
+                self.via = (head,) if travel else ()
+        elif self.direction < 0 and not self._clean(self._down):
+            self.direction = 1
+            if self.edges:
+                travel, head = head, 0
+                self.via = (head,) if travel else ()
+
+        if self.direction > 0:
+            track, seq, data = heapq.heappop(self._clean(self._up))
+        else:
+            neg, seq, data = heapq.heappop(self._clean(self._down))
+            track = -neg
+        return track, seq, data, travel + abs(track - head)
+
+    def _compact(self, keep):
+        _filter_heap(self._up, keep)
+        _filter_heap(self._down, keep)
+
+
+class LOOKScheduler(SCANScheduler):
+    name = "LOOK"
+    edges = False
+
+
+class CSCANScheduler(_Scheduler):
+    """
+    Circular SCAN: serve the current sweep in one direction only; requests
+    added behind the head wait in a separate heap for the next sweep.
+    C-SCAN runs to the end of the disk and returns to the other end
+    before the next sweep; C-LOOK jumps straight to its first request.
+    """
+
+    name = "C-SCAN"
+    edges = True
+
+    def __init__(self, disk):
+        super().__init__(disk)
+        # Heaps are min-heaps on direction * track, so one code path
+        # handles both sweep directions.
+        self._current = []
+        self._next = []
+
+    def _push(self, track, seq, data):
+        key = self.direction * track
+        if key >= self.direction * self.head:
+            heapq.heappush(self._current, (key, seq, data))
+        else:
+            heapq.heappush(self._next, (key, seq, data))
+
+    def _take(self):
+        head = self.head
+        travel = 0
+        wrapped = False
+        if not self._clean(self._current):
+            self._current, self._next = self._next, self._current
+            if self.edges:
+                wrapped = True
+                end, start = (self.size - 1, 0) if self.direction > 0 else (0, self.size - 1)
+                travel, turn, head = abs(end - head) + self.size - 1, head, start
+        key, seq, data = heapq.heappop(self._clean(self._current))
+        track = self.direction * key
+        if wrapped:
+            # Like the batch C-SCAN, an edge the head is already at, or
+            # whose request it serves, is not a separate waypoint.
+            self.via = tuple(e for e, at in ((end, turn), (start, track)) if e != at)
+        return track, seq, data, travel + abs(track - head)
+
+    def _compact(self, keep):
+        _filter_heap(self._current, keep)
+        _filter_heap(self._next, keep)
+
+
+class CLOOKScheduler(CSCANScheduler):
+    name = "C-LOOK"
+    edges = False
+
+
+class FSCANScheduler(SCANScheduler):
+    """
+    FSCAN: a SCAN sweep serves a frozen queue; everything added in the
+    meantime waits and is frozen as the next sweep's queue.
+    """
+
+    name = "FSCAN"
+
+    def __init__(self, disk):
+        super().__init__(disk)
+        self._waiting = []
+
+    def _push(self, track, seq, data):
+        self._waiting.append((track, seq, data))
+
+    def _take(self):
+        if not self._clean(self._up) and not self._clean(self._down):
+            for track, seq, data in self._waiting:
+                if seq in self._cancelled:
+                    self._cancelled.discard(seq)
+                else:
+                    SCANScheduler._push(self, track, seq, data)
+            self._waiting = []
+        return super()._take()
+
+    def _compact(self, keep):
+        super()._compact(keep)
+        self._waiting = [entry for entry in self._waiting if keep(entry)]
+
+
+class NStepScheduler(SCANScheduler):
+    """
+    N-step SCAN: requests are cut into batches of `step` in add order and
+    each batch is served with a full SCAN sweep before the next.
+    """
+
+    def __init__(self, disk, step=10):
+        if step < 1:
+            raise ValueError("step must be at least 1")
+        super().__init__(disk)
+        self.step = step
+        self.name = f"N-step SCAN (N={step})"
+        self._waiting = deque()
+
+    def _push(self, track, seq, data):
+        self._waiting.append((track, seq, data))
+
+    def _take(self):
+        if not self._clean(self._up) and not self._clean(self._down):
+            taken = 0
+            while taken < self.step and self._waiting:
+                track, seq, data = self._waiting.popleft()
+                if seq in self._cancelled:
+                    self._cancelled.discard(seq)
+                    continue
+                SCANScheduler._push(self, track, seq, data)
+                taken += 1
+        return super()._take()
+
+    def _compact(self, keep):
+        super()._compact(keep)
+        self._waiting = deque(entry for entry in self._waiting if keep(entry))
+
+
+class _TrackIndex:
+    """
+    Pending tracks (one entry per request, so repeats allowed) kept
+    sorted in blocks of at most BLOCK, with each block's last track in
+    _maxes. add(), discard() and first_at_or_after() are a bisect over
+    the block maxima plus one inside a block, and memory is proportional
+    to the pending queue, not to the disk.
+    """
+
+    BLOCK = 512
+
+    def __init__(self):
+        self._blocks = []
+        self._maxes = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def add(self, track):
+        blocks, maxes = self._blocks, self._maxes
+        self._len += 1
+        if not maxes:
+            blocks.append([track])
+            maxes.append(track)
+            return
+        i = bisect_left(maxes, track)
+        if i == len(maxes):
+            i -= 1
+            blocks[i].append(track)
+            maxes[i] = track
+        else:
+            insort(blocks[i], track)
+        block = blocks[i]
+        if len(block) > self.BLOCK:
+            half = len(block) >> 1
+            blocks[i:i + 1] = [block[:half], block[half:]]
+            maxes[i:i + 1] = [block[half - 1], block[-1]]
+
+    def discard(self, track):
+        """Remove one entry for `track`, which must be present."""
+        i = bisect_left(self._maxes, track)
+        block = self._blocks[i]
+        del block[bisect_left(block, track)]
+        self._len -= 1
+        if block:
+            self._maxes[i] = block[-1]
+        else:
+            del self._blocks[i]
+            del self._maxes[i]
+
+    def first_at_or_after(self, track):
+        """Lowest pending track >= track, or None."""
+        i = bisect_left(self._maxes, track)
+        if i == len(self._maxes):
+            return None
+        block = self._blocks[i]
+        return block[bisect_left(block, track)]
+
+
+class DeadlineScheduler(_Scheduler):
+    """
+    Deadline scheduling in the style of Linux mq-deadline.
+
+    Reads and writes each have a sorted index (by track) and a FIFO of
+    deadlines. Requests are dispatched in ascending track order, in
+    batches of up to fifo_batch from one direction (read or write). A new
+    batch starts at the oldest request of its direction instead when that
+    request's deadline has passed, or when nothing is left ahead of the
+    head. Reads are preferred, but writes get a batch after being passed
+    over writes_starved times.
+
+    Deadlines are measured in head travel (tracks moved since the request
+    was added, the 'seek' response unit of simulator.metrics). By default
+    a read expires after two full strokes of the disk and a write after
+    ten. add() takes write=True for writes.
+    """
+
+    name = "Deadline"
+
+    def __init__(self, disk, read_expire=None, write_expire=None, fifo_batch=16,
+                 writes_starved=2):
+        if fifo_batch < 1:
+            raise ValueError("fifo_batch must be at least 1")
+        super().__init__(disk)
+        stroke = max(1, disk.size - 1)
+        self.expire = (
+            2 * stroke if read_expire is None else read_expire,
+            10 * stroke if write_expire is None else write_expire,
+        )
+        self.fifo_batch = fifo_batch
+        self.writes_starved = writes_starved
+        self._queued = {}  # seq -> [track, data, write]
+        # Per direction (0 = read, 1 = write): sorted index of pending
+        # tracks and FIFO of (deadline, seq, track).
+        self._index = (_TrackIndex(), _TrackIndex())
+        self._fifo = [deque(), deque()]
+        self._batch_dir = 0
+        self._batching = 0
+        self._starved = 0
+
+    def add(self, track, data=None, write=False):
+        seq = super().add(track, data)
+        entry = self._queued[seq]
+        entry[2] = d = 1 if write else 0
+        self._index[d].add(track)
+        self._fifo[d].append((self.total_seek + self.expire[d], seq, track))
+        return seq
+
+    def cancel(self, track):
+        # The oldest request at this track may be a read or a write, so
+        # look it up before the base class forgets it.
+        seqs = self._seqs(track)
+        if seqs:
+            self._unindex(seqs[0], self._queued.pop(seqs[0]))
+        return super().cancel(track)
+
+    def _push(self, track, seq, data):
+        self._queued[seq] = [track, data, 0]
+
+    def _unindex(self, seq, entry):
+        self._index[entry[2]].discard(entry[0])
+
+    def _oldest(self, d):
+        # Front of a FIFO, skipping requests already dispatched or cancelled.
+        fifo, queued = self._fifo[d], self._queued
+        while fifo and fifo[0][1] not in queued:
+            self._cancelled.discard(fifo.popleft()[1])
+        return fifo[0] if fifo else None
+
+    def _take(self):
+        head = self.head
+        d = self._batch_dir
+        track = None
+        if self._batching < self.fifo_batch:
+            track = self._index[d].first_at_or_after(head)
+        if track is None:
+            reads, writes = map(len, self._index)
+            if reads and not (writes and self._starved >= self.writes_starved):
+                d = 0
+                if writes:
+                    self._starved += 1
+            else:
+                d = 1
+                self._starved = 0
+            oldest = self._oldest(d)
+            track = self._index[d].first_at_or_after(head)
+            if track is None or oldest[0] <= self.total_seek:
+                track = oldest[2]
+            self._batch_dir = d
+            self._batching = 0
+
+        self._batching += 1
+        # The oldest pending request at the track in direction d.
+        queued = self._queued
+        for seq in self._seqs(track):
+            if queued[seq][2] == d:
+                break
+        entry = queued.pop(seq)
+        self._index[d].discard(track)
+        return track, seq, entry[1], abs(track - head)
+
+    def _compact(self, keep):
+        queued = self._queued
+        self._fifo = [deque(e for e in fifo if e[1] in queued) for fifo in self._fifo]
+
+
+class _ProcessQueue:
+    """One process's requests in BFQScheduler, swept in ascending order."""
+
+    __slots__ = ("weight", "live", "position", "current", "next", "start", "finish",
+                 "served")
+
+    def __init__(self, weight, position):
+        self.weight = weight
+        self.live = 0
+        self.position = position  # track of this queue's last dispatch
+        self.current = []  # (track, seq) at or after position
+        self.next = []     # (track, seq) behind it, for the next sweep
+        self.start = 0.0
+        self.finish = 0.0
+        self.served = 0
+
+
+class BFQScheduler(_Scheduler):
+    """
+    Budget fair queueing in the style of Linux BFQ.
+
+    Every process has its own queue. One queue at a time is active and
+    gets the disk exclusively until it has dispatched `budget` requests
+    or runs dry; its requests go in ascending track order from where
+    that queue last left off (C-LOOK per process). The next active queue
+    is the backlogged one with the smallest virtual finish time
+    (start + budget / weight), as in weighted fair queueing, so over
+    time each process gets disk service in proportion to its weight no
+    matter how its requests are laid out.
+
+    add() takes process= (any hashable, default 0) and weights maps
+    process -> weight (default 1). Budgets count requests, not sectors,
+    and there is no slice timeout or idling.
+    """
+
+    name = "BFQ"
+
+    def __init__(self, disk, budget=16, weights=None):
+        if budget < 1:
+            raise ValueError("budget must be at least 1")
+        super().__init__(disk)
+        self.budget = budget
+        self.weights = dict(weights or {})
+        self._queues = {}  # process -> _ProcessQueue
+        self._owner = {}   # seq -> process
+        self._data = {}    # seq -> data
+        self._ready = []   # heap of (finish, order, process) of backlogged queues
+        self._order = 0
+        self._active = None
+        self._vtime = 0.0
+
+    def add(self, track, data=None, process=0):
+        seq = super().add(track, data)
+        q = self._queues.get(process)
+        if q is None:
+            q = self._queues[process] = _ProcessQueue(self.weights.get(process, 1), self.head)
+        self._owner[seq] = process
+        heapq.heappush(q.current if track >= q.position else q.next, (track, seq))
+        q.live += 1
+        if q.live == 1 and process != self._active:
+            # Newly backlogged: start no earlier than the system's virtual time.
+            q.start = max(self._vtime, q.finish)
+            self._schedule(process, q)
+        return seq
+
+    def cancel(self, track):
+        seq = super().cancel(track)
+        self._data.pop(seq)
+        self._queues[self._owner.pop(seq)].live -= 1
+        return seq
+
+    def _push(self, track, seq, data):
+        self._data[seq] = data
+
+    def _schedule(self, process, q):
+        q.finish = q.start + self.budget / q.weight
+        heapq.heappush(self._ready, (q.finish, self._order, process))
+        self._order += 1
+
+    def _expire(self):
+        # Charge the active queue for what it used and requeue it if it
+        # still has requests.
+        process = self._active
+        q = self._queues[process]
+        q.finish = q.start + q.served / q.weight
+        self._active = None
+        if q.live:
+            q.start = q.finish
+            self._schedule(process, q)
+
+    def _activate(self):
+        queues, ready = self._queues, self._ready
+        while True:
+            finish, _, process = heapq.heappop(ready)
+            q = queues[process]
+            # Skip stale entries: the queue was rescheduled or emptied.
+            if q.live and finish == q.finish:
+                break
+        self._active = process
+        self._vtime = max(self._vtime, q.start)
+        q.served = 0
+        return q
+
+    def _take(self):
+        if self._active is not None:
+            q = self._queues[self._active]
+            if not q.live or q.served >= self.budget:
+                self._expire()
+        q = self._queues[self._active] if self._active is not None else self._activate()
+
+        if not self._clean(q.current):
+            q.current, q.next = q.next, q.current
+        track, seq = heapq.heappop(self._clean(q.current))
+        q.position = track
+        q.live -= 1
+        q.served += 1
+        del self._owner[seq]
+        return track, seq, self._data.pop(seq), abs(track - self.head)
+
+    def _compact(self, keep):
+        for q in self._queues.values():
+            _filter_heap(q.current, keep)
+            _filter_heap(q.next, keep)
+
+
+SCHEDULERS = {
+    "fcfs": FCFSScheduler,
+    "sstf": SSTFScheduler,
+    "scan": SCANScheduler,
+    "cscan": CSCANScheduler,
+    "look": LOOKScheduler,
+    "clook": CLOOKScheduler,
+    "nstep": NStepScheduler,
+    "fscan": FSCANScheduler,
+    "deadline": DeadlineScheduler,
+    "bfq": BFQScheduler,
+}
+
+
+def make_scheduler(policy, disk, step=10, budget=16):
+    """
+    Scheduler for a policy name from SCHEDULERS, starting in disk's state.
+    step is the batch size of 'nstep', budget the per-turn budget of 'bfq'.
+    """
+    if policy not in SCHEDULERS:
+        raise ValueError(f"Unsupported policy {policy!r}, expected one of {tuple(SCHEDULERS)}")
+    if policy == "nstep":
+        return NStepScheduler(disk, step)
+    if policy == "bfq":
+        return BFQScheduler(disk, budget)
+    return SCHEDULERS[policy](disk)
@@ -0,0 +1,189 @@
+"""
+Opt-in instrumentation for the scheduling hot paths.
+
+    from simulator.instrument import recording
+
+    with recording() as rec:
+        simulate_sstf(requests, disk).total_seek
+    rec.report()
+
+While a Recorder is active, the algorithms report:
+  phases    wall time per named phase (e.g. "SSTF.sort", "SCAN.walk",
+            "result.seek"), with call counts and, with memory=True, the
+            peak bytes allocated inside the phase (via tracemalloc)
+  counters  decision counts (e.g. "SSTF.decisions", "SPTF.candidates")
+
+Approach:
+- Instrumented code calls phase(name) and count(name, n) a handful of
+  times per simulation, never per request: loops keep plain local
+  counters and report them once at the end.
+- With no active Recorder, phase() returns one shared no-op context
+  manager and count() returns immediately, so the disabled path is a
+  function call and an attribute check per phase.
+- Recording is process-wide (all threads report to the active Recorder).
+  Nested phases are timed independently; their memory peaks overlap.
+"""
+
+import sys
+import time
+
+# tracemalloc is imported only by the memory=True paths.
+
+_active = None
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("recorder", "name", "start", "base")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        if self.recorder.memory:
+            import tracemalloc
+            self.base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        peak = 0
+        if self.recorder.memory:
+            import tracemalloc
+            peak = max(0, tracemalloc.get_traced_memory()[1] - self.base)
+        self.recorder.add_phase(self.name, seconds, peak)
+        return False
+
+
+class Recorder:
+    def __init__(self, memory=False, on_phase=None):
+        """
+        memory: also trace allocations per phase (slows the run down)
+        on_phase: optional callback(name, seconds, peak_bytes) called as
+                  each phase ends
+        """
+        self.memory = memory
+        self.on_phase = on_phase
+        self.phases = {}    # name -> [calls, seconds, peak bytes]
+        self.counters = {}  # name -> total
+
+    def add_phase(self, name, seconds, peak=0):
+        entry = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [1, seconds, peak]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], peak)
+        if self.on_phase is not None:
+            self.on_phase(name, seconds, peak)
+
+    def add(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self, out=sys.stdout):
+        if self.phases:
+            header = f"{'phase':<24} {'calls':>8} {'total ms':>10}"
+            if self.memory:
+                header += f" {'peak KiB':>10}"
+            print(header, file=out)
+            print("-" * len(header), file=out)
+            for name, (calls, seconds, peak) in self.phases.items():
+                line = f"{name:<24} {calls:>8} {seconds * 1e3:>10.2f}"
+                if self.memory:
+                    line += f" {peak / 1024:>10.1f}"
+                print(line, file=out)
+        if self.counters:
+            print(file=out)
+            width = max(len(name) for name in self.counters)
+            for name, value in self.counters.items():
+                print(f"{name:<{width}}  {value:>12,}", file=out)
+
+
+class recording:
+    """
+    Context manager that makes a Recorder active for its duration and
+    returns it. Recordings nest: the outer one is restored on exit.
+    """
+
+    def __init__(self, memory=False, on_phase=None):
+        self.recorder = Recorder(memory, on_phase)
+        self._previous = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        global _active
+        if self.recorder.memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        self._previous = _active
+        _active = self.recorder
+        return self.recorder
+
+    def __exit__(self, *exc):
+        global _active
+        _active = self._previous
+        if self._started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+        return False
+
+
+def phase(name):
+    """Context manager timing one phase; a shared no-op when not recording."""
+    if _active is None:
+        return _NULL_PHASE
+    return _Phase(_active, name)
+
+
+def count(name, n=1):
+    """Add n to a counter of the active Recorder, if any."""
+    if _active is not None:
+        _active.add(name, n)
+
+
+def enabled():
+    return _active is not None
+
+
+def profile_call(fn, *args, pstats_path=None, memory=False, out=sys.stderr, **kwargs):
+    """
+    Run fn(*args, **kwargs) while recording, print the phase/counter report
+    to out, and, with pstats_path, also run it under cProfile and dump
+    the stats there (read them with python -m pstats). Returns fn's result.
+    """
+    import cProfile
+
+    profiler = cProfile.Profile() if pstats_path else None
+    with recording(memory=memory) as rec:
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            elapsed = time.perf_counter() - start
+            print(f"\nProfile ({elapsed * 1e3:.2f} ms total):", file=out)
+            rec.report(out)
+            if profiler is not None:
+                profiler.dump_stats(pstats_path)
+                print(f"\ncProfile stats written to {pstats_path}", file=out)
@@ -0,0 +1,192 @@
+"""
+Per-request response metrics.
+
+total_seek says how much the head moved; it says nothing about how long
+individual requests waited. Here every serviced request gets a response
+value, and the values are recorded in a fixed-memory histogram so tail
+latency can be compared across policies on traces of any length.
+
+Response of a request:
+  batch results   cumulative head travel (tracks) from the start until the
+                  head reaches the request, or cumulative service time in
+                  ms with unit="ms" (needs a drive geometry)
+  event streams   finish - arrival of each ServiceEvent
+
+Approach:
+- Histogram is log-linear, like an HDR histogram: values below 2**(p+1)
+  get their own bucket, above that each power of two is split into 2**p
+  buckets. With the default p=7 any recorded value is known to within
+  1/128 (< 0.8%), and the whole 64-bit range fits in ~8k counters
+  (64 KiB), however many values are recorded.
+- Percentiles walk the buckets once; count, total, min and max are exact.
+- A request counts as starved when its response is more than
+  STARVATION_FACTOR times the median response (or over an explicit
+  threshold), i.e. it waited far longer than a typical request.
+"""
+
+from array import array
+
+PRECISION_BITS = 7
+CHUNK = 65536  # positions converted to ints at a time
+STARVATION_FACTOR = 4
+
+
+class Histogram:
+    def __init__(self, precision=PRECISION_BITS, resolution=1):
+        """
+        precision: sub-bucket bits p; relative error is at most 1/2**p
+        resolution: size of one histogram unit. Values are stored as
+                    round(value / resolution), so e.g. 0.001 keeps ms
+                    values to the microsecond.
+        """
+        self.precision = precision
+        self.resolution = resolution
+        self._sub = 1 << precision
+        buckets = (64 - precision) * self._sub
+        self.counts = array("q", bytes(8 * buckets))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, v):
+        e = v.bit_length() - self.precision - 1
+        if e <= 0:
+            return v
+        return e * self._sub + (v >> e)
+
+    def _highest(self, index):
+        # Largest value that lands in bucket `index`.
+        if index < 2 * self._sub:
+            return index
+        e = index // self._sub - 1
+        m = index - e * self._sub
+        return ((m + 1) << e) - 1
+
+    def record(self, value, count=1):
+        if value < 0:
+            raise ValueError("histogram values must be non-negative")
+        v = round(value / self.resolution) if self.resolution != 1 else int(value)
+        self.counts[self._index(v)] += count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add another histogram with the same precision and resolution."""
+        if (other.precision, other.resolution) != (self.precision, self.resolution):
+            raise ValueError("can only merge histograms with the same layout")
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct):
+        """Nearest-rank percentile (0 < pct <= 100), to histogram precision."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c:
+                seen += c
+                if seen >= rank:
+                    if self.resolution == 1:
+                        return min(self._highest(i), self.max)
+                    return min(round(self._highest(i) * self.resolution, 9), self.max)
+        return self.max
+
+    def count_above(self, threshold):
+        """Recorded values above threshold, to histogram precision."""
+        v = round(threshold / self.resolution) if self.resolution != 1 else int(threshold)
+        start = self._index(v) + 1
+        return sum(self.counts[start:])
+
+
+def response_times(result, unit="seek"):
+    """
+    Yield (order, track, response) for every serviced request of a
+    SimulationResult, in service order. order counts from 1; edge
+    waypoints are travelled through but are not requests.
+
+    unit: 'seek' (cumulative tracks travelled) or 'ms' (cumulative
+          service time; needs result.service_times)
+    """
+    if unit not in ("seek", "ms"):
+        raise ValueError("unit must be 'seek' or 'ms'")
+    times = None
+    if unit == "ms":
+        times = result.service_times
+        if times is None:
+            raise ValueError("unit='ms' needs a result with a drive geometry")
+
+    positions = result.positions
+    waypoints = set(result.waypoints)
+    elapsed = 0
+    order = 0
+    for offset in range(0, len(positions) - 1, CHUNK):
+        part = positions[offset:offset + CHUNK + 1].tolist()
+        prev = part[0]
+        step = offset
+        for pos in part[1:]:
+            step += 1
+            elapsed += abs(pos - prev) if times is None else times[step - 1]
+            prev = pos
+            if step not in waypoints:
+                order += 1
+                yield order, pos, elapsed
+
+
+def response_histogram(result, unit="seek", histogram=None):
+    """Record every response of a SimulationResult in a Histogram."""
+    if histogram is None:
+        histogram = Histogram(resolution=1 if unit == "seek" else 0.001)
+    record = histogram.record
+    for _, _, response in response_times(result, unit):
+        record(response)
+    return histogram
+
+
+def event_histogram(events, histogram=None, resolution=0.001):
+    """
+    Record finish - arrival of every ServiceEvent from
+    simulator.events.simulate_events. events is consumed as it streams.
+    """
+    if histogram is None:
+        histogram = Histogram(resolution=resolution)
+    record = histogram.record
+    for event in events:
+        record(event.finish - event.arrival)
+    return histogram
+
+
+def summarize(histogram, starvation=None):
+    """
+    Dict of count, mean, p50, p95, p99, max, starved and the starvation
+    threshold used (STARVATION_FACTOR x p50 unless given).
+    """
+    p50 = histogram.percentile(50)
+    threshold = starvation if starvation is not None else STARVATION_FACTOR * p50
+    return {
+        "count": histogram.count,
+        "mean": histogram.mean,
+        "p50": p50,
+        "p95": histogram.percentile(95),
+        "p99": histogram.percentile(99),
+        "max": histogram.max or 0,
+        "starved": histogram.count_above(threshold) if histogram.count else 0,
+        "starvation_threshold": threshold,
+    }
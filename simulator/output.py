@@ -0,0 +1,148 @@
+"""
+Writers for simulation results.
+
+Everything here streams: step rows are produced from the positions array
+in fixed-size chunks and written as they are formatted, so the output
+path never holds more than one chunk of rows (or strings) in memory.
+
+  write_summary  header lines only (algorithm, counts, seek totals)
+  write_responses response percentiles and starvation count
+  write_steps    summary plus a step table, written row by row
+  write_json     one JSON object with the summary and all positions
+  write_csv      step,from,to,seek rows
+  write_binary   raw int64 positions in native byte order
+"""
+
+import json
+
+from .metrics import summarize
+
+CHUNK = 65536  # positions formatted per write
+
+
+def _position_chunks(positions, chunk=CHUNK):
+    """
+    Yield (offset, list of ints) slices of positions, each overlapping the
+    previous one by one element so steps can be formed across the cut.
+    """
+    n = len(positions)
+    start = 0
+    while start < n - 1:
+        stop = min(n, start + chunk + 1)
+        yield start, positions[start:stop].tolist()
+        start = stop - 1
+
+
+def iter_steps(positions, chunk=CHUNK):
+    """Yield (step, from, to, seek) for every move, one chunk of positions at a time."""
+    for offset, part in _position_chunks(positions, chunk):
+        prev = part[0]
+        step = offset
+        for pos in part[1:]:
+            step += 1
+            yield step, prev, pos, abs(pos - prev)
+            prev = pos
+
+
+def summary(result, disk):
+    """The summary fields shared by every writer, as a dict."""
+    info = {
+        "algorithm": result.algorithm_name,
+        "requests": result.num_requests,
+        "head": disk.head,
+        "steps": max(0, len(result.positions) - 1),
+        "total_seek": result.total_seek,
+        "average_seek": result.average_seek,
+    }
+    if result.service_times is not None:
+        info["total_service_ms"] = result.total_service_ms
+        info["average_service_ms"] = result.average_service_ms
+    return info
+
+
+def write_summary(result, disk, f):
+    info = summary(result, disk)
+    f.write(f"\nAlgorithm: {info['algorithm']}\n")
+    f.write(f"Requests: {info['requests']}\n")
+    f.write(f"Head start: {info['head']}\n")
+    f.write(f"Total seek: {info['total_seek']}\n")
+    f.write(f"Average seek: {info['average_seek']:.2f}\n")
+    if "total_service_ms" in info:
+        f.write(f"Total service time: {info['total_service_ms']:.2f} ms\n")
+        f.write(f"Average service time: {info['average_service_ms']:.2f} ms\n")
+
+
+def write_responses(result, disk, f, unit="seek"):
+    """Response percentiles and starvation count (see simulator.metrics)."""
+    info = summarize(result.response_histogram(unit))
+    label = "tracks" if unit == "seek" else "ms"
+    f.write(f"\nResponse ({label} until serviced):\n")
+    f.write(f"  p50 {info['p50']:.2f}  p95 {info['p95']:.2f}  "
+            f"p99 {info['p99']:.2f}  max {info['max']:.2f}\n")
+    f.write(f"  Starved (> {info['starvation_threshold']:.2f}): {info['starved']}\n")
+
+
+def write_steps(result, disk, f):
+    """
+    Summary plus a github-style step table. Column widths come from the
+    largest possible values (step count and disk size) instead of a pass
+    over all rows, so rows can be written as soon as they are formatted.
+    """
+    write_summary(result, disk, f)
+    w_step = max(4, len(str(len(result.positions))))
+    w_track = max(4, len(str(max(disk.size - 1, 0))))
+    row = f"| {{:>{w_step}}} | {{:>{w_track}}} | {{:>{w_track}}} | {{:>{w_track}}} |\n"
+
+    f.write("\nStep-by-step movement:\n")
+    f.write(row.format("Step", "From", "To", "Seek"))
+    f.write(f"|{'-' * (w_step + 2)}|{'-' * (w_track + 2)}|{'-' * (w_track + 2)}|{'-' * (w_track + 2)}|\n")
+    lines = []
+    for step in iter_steps(result.positions):
+        lines.append(row.format(*step))
+        if len(lines) >= CHUNK:
+            f.writelines(lines)
+            lines.clear()
+    f.writelines(lines)
+
+
+def write_json(result, disk, f):
+    """
+    {"algorithm": ..., "total_seek": ..., ..., "waypoints": [...],
+     "positions": [...]} -- positions are written chunk by chunk.
+    """
+    info = summary(result, disk)
+    info["waypoints"] = list(result.waypoints)
+    head = json.dumps(info)
+    f.write(head[:-1] + ', "positions": [')
+    positions = result.positions
+    for start in range(0, len(positions), CHUNK):
+        part = positions[start:start + CHUNK].tolist()
+        if start:
+            f.write(", ")
+        f.write(", ".join(map(str, part)))
+    f.write("]}\n")
+
+
+def write_csv(result, disk, f):
+    f.write("step,from,to,seek\n")
+    lines = []
+    for step in iter_steps(result.positions):
+        lines.append("%d,%d,%d,%d\n" % step)
+        if len(lines) >= CHUNK:
+            f.writelines(lines)
+            lines.clear()
+    f.writelines(lines)
+
+
+def write_binary(result, disk, f):
+    """Raw int64 positions (native byte order), including the start head."""
+    f.write(memoryview(result.positions).cast("B"))
+
+
+WRITERS = {
+    "summary": write_summary,
+    "stream": write_steps,
+    "json": write_json,
+    "csv": write_csv,
+    "binary": write_binary,
+}
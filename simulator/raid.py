@@ -0,0 +1,208 @@
+"""
+Multi-disk (RAID) array simulation.
+
+A logical request stream is mapped onto N member disks with a RAID
+layout, and each member's queue is then scheduled independently with any
+simulate_* policy. Members are simulated in parallel worker processes,
+like the spindles of a real array.
+
+Logical addresses are in track units: logical track L of the array maps
+to one track on one (or, for mirrored writes, several) members.
+
+Layouts:
+  raid0   stripe units of `stripe` tracks rotate across all members
+  raid1   every member holds a full copy; reads go to the members in
+          turn, writes go to all of them
+  raid10  members form mirrored pairs and stripe units rotate across the
+          pairs; reads alternate inside a pair, writes go to both
+"""
+
+import os
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .disk import Disk
+
+LAYOUTS = ("raid0", "raid1", "raid10")
+
+MemberStats = namedtuple(
+    "MemberStats",
+    ["member", "requests", "total_seek", "average_seek", "service_ms"],
+)
+
+
+def _stripe(lba, stripe, width):
+    """(column, track on that column) of a logical track in a stripe set."""
+    unit, offset = divmod(lba, stripe)
+    row, column = divmod(unit, width)
+    return column, row * stripe + offset
+
+
+def map_requests(requests, layout, members, stripe=1, writes=None):
+    """
+    Split a logical request stream into one queue per member disk.
+
+    requests: logical track numbers, in arrival order
+    layout: one of LAYOUTS
+    members: number of member disks
+    stripe: stripe unit in tracks (raid0 / raid10)
+    writes: optional sequence of booleans, True where the request is a
+            write (only matters for mirrored layouts)
+
+    Returns a list of array('q'), one per member, each in arrival order.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unsupported layout {layout!r}, expected one of {LAYOUTS}")
+    if members < 1 or (layout == "raid10" and members % 2):
+        raise ValueError(f"{layout} cannot use {members} member disks")
+    if stripe < 1:
+        raise ValueError("stripe must be at least 1")
+
+    queues = [array("q") for _ in range(members)]
+    flags = iter(writes) if writes is not None else None
+    turn = 0  # round-robin pointer for mirrored reads
+
+    if layout == "raid0":
+        for lba in requests:
+            column, track = _stripe(lba, stripe, members)
+            queues[column].append(track)
+    elif layout == "raid1":
+        for lba in requests:
+            if flags is not None and next(flags):
+                for q in queues:
+                    q.append(lba)
+            else:
+                queues[turn].append(lba)
+                turn = (turn + 1) % members
+    else:
+        pairs = members // 2
+        reads = [0] * pairs
+        for lba in requests:
+            pair, track = _stripe(lba, stripe, pairs)
+            if flags is not None and next(flags):
+                queues[2 * pair].append(track)
+                queues[2 * pair + 1].append(track)
+            else:
+                queues[2 * pair + reads[pair]].append(track)
+                reads[pair] ^= 1
+    return queues
+
+
+def _simulate_member(policy, queue, size, head, direction, geometry, options):
+    disk = Disk(size=size, head=head, direction=direction, geometry=geometry)
+    return policy(queue, disk, **options)
+
+
+class ArrayResult:
+    def __init__(self, layout, results, requests):
+        """
+        layout: RAID layout name
+        results: SimulationResult of each member disk, in member order
+        requests: number of logical requests sent to the array
+        """
+        self.layout = layout
+        self.results = results
+        self.requests = requests
+
+    @property
+    def members(self):
+        return [
+            MemberStats(i, r.num_requests, r.total_seek, r.average_seek, r.total_service_ms)
+            for i, r in enumerate(self.results)
+        ]
+
+    @property
+    def total_requests(self):
+        """Logical requests completed by the array."""
+        return self.requests
+
+    @property
+    def member_requests(self):
+        """Requests serviced by the member disks (mirrored writes count once per copy)."""
+        return sum(r.num_requests for r in self.results)
+
+    @property
+    def write_amplification(self):
+        """Member requests per logical request (1.0 = no mirroring overhead)."""
+        return self.member_requests / self.requests if self.requests else 1.0
+
+    @property
+    def total_seek(self):
+        """Head movement summed over all spindles."""
+        return sum(r.total_seek for r in self.results)
+
+    @property
+    def makespan_seek(self):
+        """Seek of the busiest spindle: the array finishes when it does."""
+        return max((r.total_seek for r in self.results), default=0)
+
+    @property
+    def throughput(self):
+        """
+        Logical requests completed per unit of time. With a drive geometry
+        the unit is seconds of the slowest member's service time, otherwise
+        it is tracks of the busiest member's head travel. Mirrored writes
+        count once; see write_amplification for the member-level I/O.
+        """
+        service = [r.total_service_ms for r in self.results]
+        if service and all(s is not None for s in service):
+            busiest = max(service)
+            return self.total_requests / (busiest / 1000) if busiest else 0.0
+        busiest = self.makespan_seek
+        return self.total_requests / busiest if busiest else 0.0
+
+    @property
+    def load_imbalance(self):
+        """Most loaded member's request count over the mean member count (1.0 = even)."""
+        return _imbalance([r.num_requests for r in self.results])
+
+    @property
+    def seek_imbalance(self):
+        """Busiest member's seek over the mean seek (1.0 = even)."""
+        return _imbalance([r.total_seek for r in self.results])
+
+
+def _imbalance(values):
+    if not values:
+        return 1.0
+    mean = sum(values) / len(values)
+    return max(values) / mean if mean else 1.0
+
+
+def simulate_array(requests, disk, policy, layout="raid0", members=2, stripe=1,
+                   writes=None, workers=None, **options):
+    """
+    Simulate a RAID array of identical member disks.
+
+    requests: logical track numbers
+    disk: Disk describing one member (size, starting head, direction,
+          geometry); every member starts in that state
+    policy: any simulate_* function, e.g. simulate_sstf
+    layout, members, stripe, writes: see map_requests
+    workers: processes to use (default: one per member, capped at the
+             CPU count); 0 simulates the members in this process
+    options: extra keyword arguments for the policy (e.g. backend)
+
+    Returns an ArrayResult.
+    """
+    queues = map_requests(requests, layout, members, stripe, writes)
+    for q in queues:
+        if q and min(q) < 0:
+            raise ValueError(f"Negative logical request {min(requests)}")
+        if q and max(q) >= disk.size:
+            raise ValueError(
+                f"Logical requests exceed the array: member track {max(q)} "
+                f"out of range 0..{disk.size-1}"
+            )
+
+    args = [(policy, q, disk.size, disk.head, disk.direction, disk.geometry, options)
+            for q in queues]
+    if workers == 0:
+        results = [_simulate_member(*a) for a in args]
+    else:
+        workers = workers or min(members, os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_simulate_member, *a) for a in args]
+            results = [f.result() for f in futures]
+    return ArrayResult(layout, results, len(requests))
@@ -0,0 +1,104 @@
+"""
+Registry of scheduling algorithms by name.
+
+    from simulator import registry
+
+    sim_fn = registry.load("sstf")
+    options = registry.select_options("nstep", {"step": 20, "sectors": None})
+
+Every entry names its simulate_* function as a "module:function" string
+and lists the keyword options it accepts. The module is only imported
+the first time the algorithm is loaded, so a single-shot CLI run imports
+just the code it needs.
+
+New policies register without touching run_sim.py:
+
+    # mypolicies.py
+    from simulator import registry
+    registry.register("rr", "mypolicies:simulate_rr", options=("backend",))
+
+and are then available as `run_sim.py --plugin mypolicies -a rr ...`
+(and to the batch, compare, sweep and raid subcommands and the
+benchmark suite, which all take --plugin too).
+"""
+
+import importlib
+from collections import namedtuple
+
+Policy = namedtuple("Policy", ["name", "target", "options", "help", "default"])
+
+_POLICIES = {}
+_LOADED = {}
+
+
+def register(name, target, options=("backend",), help="", default=True):
+    """
+    Add (or replace) an algorithm.
+
+    target: "package.module:function", imported on first use, or the
+            function itself
+    options: keyword options the function accepts; select_options only
+             ever passes these
+    default: include it when compare, sweep and bench run "all"
+             algorithms (False for policies too slow for large workloads)
+    """
+    if not callable(target) and ":" not in target:
+        raise ValueError(f"target must be 'module:function' or a callable, got {target!r}")
+    _POLICIES[name] = Policy(name, target, tuple(options), help, default)
+    _LOADED.pop(name, None)
+
+
+def names(default_only=False):
+    """Registered names, in registration order (see register's default)."""
+    return tuple(p.name for p in _POLICIES.values() if p.default or not default_only)
+
+
+def policy(name):
+    try:
+        return _POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unsupported algorithm {name!r}, expected one of {names()}") from None
+
+
+def load(name):
+    """The simulate function for name, importing its module if needed."""
+    fn = _LOADED.get(name)
+    if fn is None:
+        target = policy(name).target
+        if callable(target):
+            fn = target
+        else:
+            module, _, attr = target.partition(":")
+            fn = getattr(importlib.import_module(module), attr)
+        _LOADED[name] = fn
+    return fn
+
+
+def select_options(name, available):
+    """The items of available that name accepts, leaving out None values."""
+    accepted = policy(name).options
+    return {k: v for k, v in available.items() if k in accepted and v is not None}
+
+
+def load_plugins(modules):
+    """Import modules that register() extra algorithms."""
+    for module in modules or ():
+        importlib.import_module(module)
+
+
+_ALGORITHMS = "simulator.algorithms"
+register("fcfs", f"{_ALGORITHMS}:simulate_fcfs", help="First come, first served")
+register("sstf", f"{_ALGORITHMS}:simulate_sstf", help="Shortest seek time first")
+register("scan", f"{_ALGORITHMS}:simulate_scan", help="Elevator, to the disk edges")
+register("cscan", f"{_ALGORITHMS}:simulate_cscan", help="One-way elevator")
+register("look", f"{_ALGORITHMS}:simulate_look", help="Elevator, reversing at the last request")
+register("clook", f"{_ALGORITHMS}:simulate_clook", help="One-way LOOK")
+register("nstep", f"{_ALGORITHMS}:simulate_nstep_scan", ("step", "backend"),
+         help="SCAN over batches of N requests")
+register("fscan", f"{_ALGORITHMS}:simulate_fscan", help="SCAN over a frozen queue")
+register("deadline", f"{_ALGORITHMS}:simulate_deadline", ("writes", "backend"),
+         help="Sorted batches with FIFO deadlines (mq-deadline style)")
+register("bfq", f"{_ALGORITHMS}:simulate_bfq", ("processes", "budget", "backend"),
+         help="Per-process budget fair queueing")
+register("sptf", f"{_ALGORITHMS}:simulate_sptf", ("sectors", "backend"),
+         help="Shortest positioning time first", default=False)
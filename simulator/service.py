@@ -0,0 +1,370 @@
+"""
+asyncio block-queue service and load generator.
+
+A BlockQueueService owns one incremental scheduler (simulator.incremental)
+and behaves like the dispatch side of a block layer: any number of
+clients submit track requests over a local Unix socket or TCP loopback,
+and a single dispatcher task asks the scheduler for the next request,
+one at a time, and reports it back as completed.
+
+    service = BlockQueueService(Disk(size=100_000), policy="sstf")
+    address = await service.start_unix("/tmp/blockq.sock")
+    report = await run_load(address, clients=2000, requests_per_client=50,
+                            disk_size=100_000)
+
+Wire format (little-endian, both directions are a stream of frames):
+  submissions  u32 count, then count x (u32 tag, i64 track)
+  completions  u32 count, then count x u32 tag
+Tags are chosen by the client and echoed back; they only need to be
+unique among a connection's outstanding requests. A malformed frame or
+an out-of-range track closes the connection.
+
+Approach:
+- Clients coalesce everything submitted during one event-loop iteration
+  into one frame per connection, and the server does the same with
+  completions, so framing cost is shared by many requests under load.
+- The dispatcher pops `quantum` requests from the scheduler (one
+  decision each), flushes completions, then yields to the event loop so
+  new submissions reach the scheduler before its next decisions.
+- The server records how long each request waited in the queue; the
+  load generator records each request's round trip. Both go into
+  metrics.Histogram, so memory stays fixed however long the run is.
+"""
+
+import asyncio
+import errno
+import os
+import random
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+from .incremental import make_scheduler
+from .metrics import Histogram, summarize
+
+HEADER = struct.Struct("<I")
+SUBMISSION = struct.Struct("<Iq")
+COMPLETION = struct.Struct("<I")
+MAX_FRAME = 1 << 16  # most requests in one frame
+
+ServiceStats = namedtuple(
+    "ServiceStats",
+    ["dispatched", "total_seek", "max_depth", "dispatch_seconds", "queue_wait"],
+)
+LoadReport = namedtuple(
+    "LoadReport",
+    ["requests", "seconds", "throughput", "latency", "service"],
+)
+
+
+def encode_frame(item, entries):
+    """One frame of `entries` (tuples for item, a struct.Struct)."""
+    return HEADER.pack(len(entries)) + b"".join(item.pack(*e) for e in entries)
+
+
+async def read_frame(reader, item):
+    """Read one frame and return its entries as a list of tuples."""
+    count, = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if count > MAX_FRAME:
+        raise ValueError(f"frame of {count} entries exceeds {MAX_FRAME}")
+    body = await reader.readexactly(count * item.size)
+    return list(item.iter_unpack(body))
+
+
+def _send_in_frames(writer, item, entries):
+    for start in range(0, len(entries), MAX_FRAME):
+        writer.write(encode_frame(item, entries[start:start + MAX_FRAME]))
+
+
+class _ClientConnection:
+    """Server side of one connection: its writer and unsent completions."""
+
+    __slots__ = ("writer", "done")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.done = []
+
+    def flush(self):
+        if self.done and not self.writer.is_closing():
+            _send_in_frames(self.writer, COMPLETION, [(tag,) for tag in self.done])
+        self.done = []
+
+
+class BlockQueueService:
+    def __init__(self, disk, policy="sstf", step=10, quantum=16, seek_time=0.0):
+        """
+        disk: Disk giving the size and starting head/direction
+        policy: a policy name from simulator.incremental.SCHEDULERS
+        step: batch size for the 'nstep' policy
+        quantum: dispatch decisions between yields to the event loop
+        seek_time: simulated seconds per track of head travel (0 = the
+                   device is infinitely fast, so only the scheduler and
+                   the service itself cost time)
+        """
+        if quantum < 1:
+            raise ValueError("quantum must be at least 1")
+        self.disk = disk
+        self.scheduler = make_scheduler(policy, disk, step)
+        self.quantum = quantum
+        self.seek_time = seek_time
+
+        self.queue_wait = Histogram(resolution=1e-6)
+        self.dispatched = 0
+        self.max_depth = 0
+        self.dispatch_seconds = 0.0  # time spent inside scheduler.pop()
+        self._wakeup = asyncio.Event()
+        self._server = None
+        self._dispatcher = None
+
+    async def start_unix(self, path):
+        """
+        Listen on a Unix socket at path; returns ('unix', path). A stale
+        socket left at path is replaced; a socket a live service still
+        accepts connections on, or any other file, is left alone.
+        """
+        try:
+            mode = os.lstat(path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"{path} exists and is not a socket")
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except ConnectionRefusedError:
+                pass  # nobody is listening: stale
+            else:
+                raise OSError(errno.EADDRINUSE, "Socket is in use by a running service", path)
+            finally:
+                probe.close()
+            os.unlink(path)
+        self._server = await asyncio.start_unix_server(self._handle, path=path)
+        self._start_dispatcher()
+        return ("unix", path)
+
+    async def start_tcp(self, host="127.0.0.1", port=0):
+        """Listen on TCP; port 0 picks a free one. Returns ('tcp', (host, port))."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._start_dispatcher()
+        return ("tcp", self._server.sockets[0].getsockname()[:2])
+
+    async def close(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def stats(self):
+        return ServiceStats(
+            self.dispatched, self.scheduler.total_seek, self.max_depth,
+            self.dispatch_seconds, summarize(self.queue_wait),
+        )
+
+    def _start_dispatcher(self):
+        self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _handle(self, reader, writer):
+        conn = _ClientConnection(writer)
+        scheduler = self.scheduler
+        try:
+            while True:
+                entries = await read_frame(reader, SUBMISSION)
+                now = time.perf_counter()
+                for tag, track in entries:
+                    scheduler.add(track, (conn, tag, now))
+                if len(scheduler) > self.max_depth:
+                    self.max_depth = len(scheduler)
+                self._wakeup.set()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self):
+        scheduler = self.scheduler
+        record = self.queue_wait.record
+        clock = time.perf_counter
+        while True:
+            if not scheduler:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            dirty = set()
+            travel = 0
+            batch = min(self.quantum, len(scheduler))
+            for _ in range(batch):
+                start = clock()
+                track, _, (conn, tag, submitted), seek = scheduler.pop()
+                now = clock()
+                self.dispatch_seconds += now - start
+                record(now - submitted)
+                travel += seek
+                conn.done.append(tag)
+                dirty.add(conn)
+            self.dispatched += batch
+
+            for conn in dirty:
+                conn.flush()
+            await asyncio.sleep(travel * self.seek_time)
+
+
+class _Connection:
+    """Client side of one connection, shared by many client coroutines."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.futures = {}  # tag -> future
+        self.outbox = []
+        self._tag = 0
+        self._flush_scheduled = False
+        self._receiver = asyncio.get_running_loop().create_task(self._receive())
+
+    def submit(self, track):
+        loop = asyncio.get_running_loop()
+        tag = self._tag
+        self._tag = (self._tag + 1) & 0xFFFFFFFF
+        future = loop.create_future()
+        self.futures[tag] = future
+        self.outbox.append((tag, track))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        self._flush_scheduled = False
+        _send_in_frames(self.writer, SUBMISSION, self.outbox)
+        self.outbox = []
+
+    async def _receive(self):
+        try:
+            while True:
+                for tag, in await read_frame(self.reader, COMPLETION):
+                    future = self.futures.pop(tag, None)
+                    if future is not None and not future.done():
+                        future.set_result(None)
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            for future in self.futures.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"connection lost: {e}"))
+
+    async def close(self):
+        self.writer.close()
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            pass
+
+
+async def _connect(address):
+    kind, where = address
+    if kind == "unix":
+        reader, writer = await asyncio.open_unix_connection(where)
+    else:
+        reader, writer = await asyncio.open_connection(*where)
+    return _Connection(reader, writer)
+
+
+async def run_load(address, clients=1000, requests_per_client=100, disk_size=200,
+                   connections=32, seed=1, service=None):
+    """
+    Drive a running service with many concurrent clients.
+
+    address: what BlockQueueService.start_unix/start_tcp returned
+    clients: concurrent client coroutines; each submits one request,
+             waits for its completion, and repeats (a closed loop, so up
+             to `clients` requests are outstanding at once)
+    requests_per_client: requests each client submits
+    disk_size: tracks are drawn uniformly from 0..disk_size-1
+    connections: sockets the clients share (submissions on one socket
+                 are batched into frames)
+    service: the BlockQueueService, when it runs in this process, to
+             include its stats in the report
+
+    Returns a LoadReport with the achieved throughput (requests/s) and
+    a summary of the per-request round-trip latency in seconds.
+    """
+    conns = [await _connect(address) for _ in range(max(1, min(connections, clients)))]
+    latency = Histogram(resolution=1e-6)
+    record = latency.record
+    clock = time.perf_counter
+
+    async def client(i):
+        rng = random.Random(seed * 1_000_003 + i)
+        conn = conns[i % len(conns)]
+        for _ in range(requests_per_client):
+            start = clock()
+            await conn.submit(rng.randrange(disk_size))
+            record(clock() - start)
+
+    start = clock()
+    try:
+        await asyncio.gather(*(client(i) for i in range(clients)))
+    finally:
+        elapsed = clock() - start
+        for conn in conns:
+            await conn.close()
+
+    total = clients * requests_per_client
+    return LoadReport(
+        total, elapsed, total / elapsed if elapsed else 0.0,
+        summarize(latency), service.stats() if service is not None else None,
+    )
+
+
+async def benchmark(disk, policy="sstf", transport="unix", clients=1000,
+                    requests_per_client=100, connections=32, quantum=16,
+                    seek_time=0.0, step=10, seed=1, path=None):
+    """
+    Start a service in this process, run the load generator against it
+    over the chosen transport ('unix' or 'tcp') and return the LoadReport.
+    """
+    service = BlockQueueService(disk, policy, step=step, quantum=quantum,
+                                seek_time=seek_time)
+    if transport == "unix":
+        with tempfile.TemporaryDirectory() as tmp:
+            address = await service.start_unix(path or os.path.join(tmp, "blockq.sock"))
+            try:
+                return await run_load(address, clients, requests_per_client,
+                                      disk.size, connections, seed, service)
+            finally:
+                await service.close()
+    address = await service.start_tcp()
+    try:
+        return await run_load(address, clients, requests_per_client,
+                              disk.size, connections, seed, service)
+    finally:
+        await service.close()
+
+
+def print_report(report, out=sys.stdout):
+    lat = report.latency
+    print(f"Requests: {report.requests:,} in {report.seconds:.3f} s "
+          f"({report.throughput:,.0f} requests/s)", file=out)
+    print(f"Round trip: p50 {lat['p50'] * 1e3:.3f} ms  p95 {lat['p95'] * 1e3:.3f} ms  "
+          f"p99 {lat['p99'] * 1e3:.3f} ms  max {lat['max'] * 1e3:.3f} ms", file=out)
+    s = report.service
+    if s is not None:
+        wait = s.queue_wait
+        per_pop = s.dispatch_seconds / s.dispatched * 1e6 if s.dispatched else 0.0
+        print(f"Dispatched: {s.dispatched:,}  total seek: {s.total_seek:,}  "
+              f"max queue depth: {s.max_depth:,}", file=out)
+        print(f"Scheduler time: {s.dispatch_seconds * 1e3:.2f} ms "
+              f"({per_pop:.2f} us per decision)", file=out)
+        print(f"Queue wait: p50 {wait['p50'] * 1e3:.3f} ms  p99 {wait['p99'] * 1e3:.3f} ms  "
+              f"max {wait['max'] * 1e3:.3f} ms", file=out)
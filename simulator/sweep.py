@@ -0,0 +1,138 @@
+"""
+Parallel parameter sweeps.
+
+Runs every combination of (workload, algorithm, disk size, head,
+direction) and collects total/average seek per point into one table.
+
+Approach:
+- Each workload is copied once into a shared-memory block of int64s.
+  Worker processes attach to those blocks when they start, so a task only
+  carries the workload *name*, never the request list itself.
+- The grid is cut into batches of points and each batch is one task for a
+  ProcessPoolExecutor, which keeps per-task overhead low when the grid has
+  thousands of small points.
+- Rows come back as SweepRow tuples and can be written as CSV or printed
+  as a table.
+"""
+
+import csv
+import os
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+
+from . import registry
+from .disk import Disk
+
+SweepRow = namedtuple(
+    "SweepRow",
+    ["workload", "algorithm", "disk_size", "head", "direction",
+     "requests", "total_seek", "average_seek"],
+)
+
+# Workloads attached in this worker process: name -> (SharedMemory, view)
+_worker_workloads = {}
+
+
+def _attach_workloads(layout, plugins):
+    """
+    Pool initializer: map every shared workload into this process.
+    layout: {workload name: (shared memory block name, number of requests)}
+    plugins: modules to import so their algorithms are registered here
+             too (needed when workers are spawned rather than forked)
+    """
+    registry.load_plugins(plugins)
+    for name, (shm_name, count) in layout.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        view = shm.buf[:count * 8].cast("q")
+        _worker_workloads[name] = (shm, view)
+
+
+def _run_batch(points, backend):
+    rows = []
+    for workload, algorithm, size, head, direction in points:
+        requests = _worker_workloads[workload][1]
+        disk = Disk(size=size, head=head, direction=direction)
+        sim_fn = registry.load(algorithm)
+        result = sim_fn(requests, disk, **registry.select_options(algorithm, {"backend": backend}))
+        rows.append(SweepRow(
+            workload, algorithm, size, head, direction,
+            result.num_requests, result.total_seek, result.average_seek,
+        ))
+    return rows
+
+
+def _share(requests):
+    data = array("q", requests)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(data) * 8))
+    shm.buf[:len(data) * 8] = data.tobytes()
+    return shm, len(data), (min(data) if data else 0), (max(data) if data else -1)
+
+
+def _batches(points, batch_size):
+    for i in range(0, len(points), batch_size):
+        yield points[i:i + batch_size]
+
+
+def sweep(workloads, algorithms, disk_sizes, heads, directions=(1,),
+          workers=None, batch_size=64, backend="python", plugins=()):
+    """
+    Run the full grid and return a list of SweepRow, in grid order.
+
+    workloads: dict of name -> sequence of track numbers
+    algorithms: simulator.registry names
+    disk_sizes, heads, directions: values to combine
+    workers: number of processes (default: os.cpu_count())
+    batch_size: grid points per task
+    plugins: modules that registered extra algorithms (see
+             registry.load_plugins); the workers import them too
+
+    Points where the head or a request falls outside the disk are skipped;
+    a workload with a negative track raises ValueError.
+    """
+    for algorithm in algorithms:
+        registry.policy(algorithm)  # ValueError if unknown
+
+    shared = {}
+    try:
+        layout = {}
+        valid = {}
+        for name, requests in workloads.items():
+            shm, count, lowest, highest = _share(requests)
+            shared[name] = shm
+            if lowest < 0:
+                raise ValueError(f"Workload {name!r} has a negative track {lowest}")
+            layout[name] = (shm.name, count)
+            valid[name] = highest
+
+        points = [
+            (name, algorithm, size, head, direction)
+            for name, algorithm, size, head, direction
+            in product(workloads, algorithms, disk_sizes, heads, directions)
+            if 0 <= head < size and valid[name] < size
+        ]
+
+        rows = []
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_attach_workloads,
+            initargs=(layout, tuple(plugins)),
+        ) as pool:
+            futures = [pool.submit(_run_batch, batch, backend)
+                       for batch in _batches(points, batch_size)]
+            for future in futures:
+                rows.extend(future.result())
+        return rows
+    finally:
+        for shm in shared.values():
+            shm.close()
+            shm.unlink()
+
+
+def write_csv(rows, f):
+    writer = csv.writer(f)
+    writer.writerow(SweepRow._fields)
+    for row in rows:
+        writer.writerow(row)
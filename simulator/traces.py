@@ -0,0 +1,217 @@
+"""
+Trace loaders for large block traces.
+
+Supported formats:
+  csv       one request per line, sector number in a given column
+            (a non-numeric first line is treated as a header)
+  blkparse  text output of blkparse, e.g.
+              8,0  3  1  0.000000000  697  Q  W 223490 + 8 [kjournald]
+            only lines with the chosen action (default 'Q', queued) count
+  bin       raw int64 sector numbers in native byte order, nothing else
+
+Files are memory-mapped and parsed in fixed-size chunks, so a multi-GB
+trace never turns into one big list of strings. Sector numbers are mapped
+to tracks of a Disk, either with a fixed sectors-per-track value or by
+scaling the sector range [0, total_sectors) onto [0, disk.size).
+"""
+
+import mmap
+from array import array
+
+from . import vectorized
+
+FORMATS = ("csv", "blkparse", "bin")
+
+CHUNK_SIZE = 1 << 20  # bytes per parsing chunk
+
+
+def _mapped(path):
+    """Open path read-only as an mmap, or return b'' for an empty file."""
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return b""
+
+
+def _line_chunks(path, chunk_size=CHUNK_SIZE):
+    """
+    Yield blocks of whole lines from the file, each about chunk_size
+    bytes, by cutting the mapped file at the last newline in each window.
+    """
+    data = _mapped(path)
+    start, end = 0, len(data)
+    while start < end:
+        stop = min(start + chunk_size, end)
+        if stop < end:
+            cut = data.rfind(b"\n", start, stop)
+            if cut < start:
+                cut = data.find(b"\n", stop)
+                if cut < 0:
+                    cut = end - 1
+            stop = cut + 1
+        yield data[start:stop]
+        start = stop
+
+
+def iter_csv(path, column=0, time_column=None, delimiter=","):
+    """
+    Yield (time, sector) from a CSV trace. time is None unless
+    time_column is given. A row that is too short or not numeric raises
+    ValueError naming its line.
+    """
+    sep = delimiter.encode()
+    first = True
+    lineno = 0
+    for chunk in _line_chunks(path):
+        for line in chunk.splitlines():
+            lineno += 1
+            if not line.strip():
+                continue
+            fields = line.split(sep)
+            try:
+                if first:
+                    first = False
+                    if not fields[column].strip().lstrip(b"-").isdigit():
+                        continue  # header row
+                sector = int(fields[column])
+                time = float(fields[time_column]) if time_column is not None else None
+            except (IndexError, ValueError):
+                raise ValueError(
+                    f"{path}, line {lineno}: no number in column {column}"
+                    + (f" / {time_column}" if time_column is not None else "")
+                    + f": {line.decode(errors='replace')!r}"
+                ) from None
+            yield time, sector
+
+
+def iter_blkparse(path, action="Q"):
+    """
+    Yield (time, sector) from blkparse text output, keeping only events
+    with the given action code. Summary lines and events without a
+    sector (e.g. plugs) are skipped.
+    """
+    wanted = action.encode()
+    for chunk in _line_chunks(path):
+        for line in chunk.splitlines():
+            fields = line.split()
+            # dev cpu seq time pid action rwbs sector + blocks [process]
+            if len(fields) < 8 or fields[5] != wanted or not fields[7].isdigit():
+                continue
+            yield float(fields[3]), int(fields[7])
+
+
+def iter_binary(path, chunk_size=CHUNK_SIZE):
+    """
+    Yield (None, sector) from a raw int64 trace, reading it in chunks
+    through a zero-copy int64 view of the mapped file.
+    """
+    data = _mapped(path)
+    if len(data) % 8:
+        raise ValueError(f"{path}: size is not a multiple of 8 bytes")
+    if not data:
+        return
+    values = memoryview(data).cast("q")
+    step = max(1, chunk_size // 8)
+    for i in range(0, len(values), step):
+        for sector in values[i:i + step]:
+            yield None, sector
+
+
+_READERS = {
+    "csv": iter_csv,
+    "blkparse": iter_blkparse,
+    "bin": iter_binary,
+}
+
+
+def iter_sectors(path, fmt, **options):
+    """Yield (time, sector) pairs from a trace in any of FORMATS."""
+    if fmt not in _READERS:
+        raise ValueError(f"Unsupported trace format {fmt!r}, expected one of {FORMATS}")
+    return _READERS[fmt](path, **options)
+
+
+def sector_mapper(disk, sectors_per_track=None, total_sectors=None):
+    """
+    Return a function mapping a sector number to a track of disk.
+    Exactly one of sectors_per_track / total_sectors must be given.
+    """
+    if sectors_per_track:
+        def to_track(sector):
+            return sector // sectors_per_track
+    elif total_sectors:
+        size = disk.size
+
+        def to_track(sector):
+            return sector * size // total_sectors
+    else:
+        raise ValueError("need sectors_per_track or total_sectors to map sectors to tracks")
+    return to_track
+
+
+def _max_sector(path, fmt, options):
+    highest = -1
+    for _, sector in iter_sectors(path, fmt, **options):
+        if sector > highest:
+            highest = sector
+    return highest
+
+
+def iter_trace(path, fmt, disk, sectors_per_track=None, total_sectors=None,
+               with_times=False, **options):
+    """
+    Stream a trace as track numbers for disk.
+
+    Yields tracks, or (time, track) pairs when with_times is set (the
+    format shape simulate_events expects). If neither sectors_per_track
+    nor total_sectors is given, the highest sector in the file is found
+    with an extra pass and the range is scaled onto the disk.
+    """
+    if not sectors_per_track and not total_sectors:
+        total_sectors = _max_sector(path, fmt, options) + 1
+    to_track = sector_mapper(disk, sectors_per_track, total_sectors)
+    limit = disk.size
+
+    for time, sector in iter_sectors(path, fmt, **options):
+        track = to_track(sector)
+        if not 0 <= track < limit:
+            raise ValueError(f"Sector {sector} maps to track {track}, out of disk range 0..{limit-1}")
+        yield (time, track) if with_times else track
+
+
+def load_trace(path, fmt, disk, sectors_per_track=None, total_sectors=None, **options):
+    """
+    Load a whole trace as a compact array of tracks (array('q'), or an
+    int64 NumPy array for binary traces when NumPy is available).
+    """
+    if fmt == "bin" and vectorized.HAVE_NUMPY:
+        return _load_binary_numpy(path, disk, sectors_per_track, total_sectors)
+    tracks = array("q")
+    tracks.extend(iter_trace(path, fmt, disk, sectors_per_track, total_sectors, **options))
+    return tracks
+
+
+def _load_binary_numpy(path, disk, sectors_per_track, total_sectors):
+    np = vectorized.np
+    data = _mapped(path)
+    if len(data) % 8:
+        raise ValueError(f"{path}: size is not a multiple of 8 bytes")
+    sectors = np.frombuffer(data, dtype=np.int64) if data else np.empty(0, dtype=np.int64)
+    if sectors_per_track:
+        tracks = sectors // sectors_per_track
+    else:
+        if not total_sectors:
+            total_sectors = int(sectors.max()) + 1 if len(sectors) else 1
+        if len(sectors) and (sectors.min() < 0 or sectors.max() >= total_sectors):
+            raise ValueError(f"{path}: sectors map outside disk range 0..{disk.size-1}")
+        # Same integer arithmetic as sector_mapper. sector * size must fit
+        # in int64; for larger address spaces use exact Python integers.
+        if (total_sectors - 1) * disk.size < 1 << 63:
+            tracks = sectors * disk.size // total_sectors
+        else:
+            tracks = (sectors.astype(object) * disk.size // total_sectors).astype(np.int64)
+    if len(tracks) and (tracks.min() < 0 or tracks.max() >= disk.size):
+        raise ValueError(f"{path}: sectors map outside disk range 0..{disk.size-1}")
+    return tracks.astype(np.int64, copy=False)
+
@@ -0,0 +1,128 @@
+"""
+Optional NumPy backend.
+
+Each function here computes a whole schedule (or the seek metrics of one)
+with array operations instead of a Python-level loop. Everything is int64,
+so the positions are exactly the ones the pure-Python algorithms produce.
+
+NumPy is optional: if it is not installed HAVE_NUMPY is False and the
+algorithms keep using their pure-Python code path.
+
+NumPy is imported on first use, not when this module is imported: it is
+most of the start-up time of a short run_sim.py run that never needs it.
+Reading vectorized.np or vectorized.HAVE_NUMPY imports it.
+"""
+
+from array import array
+
+BACKENDS = ("python", "numpy")
+
+# Below this many elements a Python loop is cheaper than importing NumPy
+# and converting the data to an array.
+MIN_LENGTH = 1 << 14
+
+
+def _numpy():
+    """The numpy module, imported on the first call; None if missing."""
+    global np, HAVE_NUMPY
+    try:
+        return np
+    except NameError:
+        pass
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    HAVE_NUMPY = np is not None
+    return np
+
+
+def __getattr__(name):
+    if name in ("np", "HAVE_NUMPY"):
+        _numpy()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def use_numpy(backend):
+    """
+    True if the given backend name should run on NumPy.
+    'numpy' falls back to the Python path when NumPy is missing.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    return backend == "numpy" and _numpy() is not None
+
+
+def worthwhile(length):
+    """
+    True if NumPy is installed and an operation over `length` elements is
+    big enough to be worth it (see MIN_LENGTH).
+    """
+    return length >= MIN_LENGTH and _numpy() is not None
+
+
+def as_int64(values):
+    """
+    View requests/positions as an int64 NumPy array.
+    array('q') buffers are wrapped without copying.
+    """
+    np = _numpy()
+    if isinstance(values, array) and values.typecode == "q":
+        return np.frombuffer(values, dtype=np.int64)
+    return np.asarray(values, dtype=np.int64)
+
+
+def fcfs_positions(requests, head):
+    np = _numpy()
+    r = as_int64(requests)
+    positions = np.empty(len(r) + 1, dtype=np.int64)
+    positions[0] = head
+    positions[1:] = r
+    return positions
+
+
+def sweep_positions(requests, head, direction, size, circular, edges):
+    """
+    Vectorized version of algorithms._sweep: one np.sort, a searchsorted
+    split at the head and a single concatenate.
+    Returns (positions, waypoints).
+    """
+    np = _numpy()
+    ordered = np.sort(as_int64(requests))
+    up = direction >= 0
+    cut = np.searchsorted(ordered, head, side="left" if up else "right")
+    if up:
+        ahead, behind = ordered[cut:], ordered[:cut]
+    else:
+        ahead, behind = ordered[:cut][::-1], ordered[cut:]
+
+    parts = [np.array([head], dtype=np.int64), ahead]
+    waypoints = []
+    length = 1 + len(ahead)
+    if len(behind):
+        last = ahead[-1] if len(ahead) else head
+        if circular:
+            if not up:
+                behind = behind[::-1]
+            end, start = (size - 1, 0) if up else (0, size - 1)
+            turns = [end, start] if edges else []
+            if edges and last == end:
+                turns.remove(end)
+            if edges and behind[0] == start:
+                turns.remove(start)
+        else:
+            if up:
+                behind = behind[::-1]
+            end = size - 1 if up else 0
+            turns = [end] if edges and last != end else []
+        waypoints = list(range(length, length + len(turns)))
+        parts.append(np.array(turns, dtype=np.int64))
+        parts.append(behind)
+    return np.concatenate(parts), waypoints
+
+
+def seek_distances(positions):
+    """|positions[i] - positions[i-1]| for every step, as an int64 array."""
+    np = _numpy()
+    return np.abs(np.diff(as_int64(positions)))
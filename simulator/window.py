@@ -0,0 +1,160 @@
+"""
+Bounded queue depth (NCQ-style) scheduling.
+
+The simulate_* functions reorder the whole request list at once. A real
+drive only reorders the commands in its queue: with native command
+queueing that is at most `depth` requests (typically 32), and the host
+sends the next request as soon as one completes and frees a slot.
+
+    result = simulate_window(requests, disk, policy="sstf", depth=32)
+    stats = replay_window(iter_trace(path, "bin", disk), disk, "sstf", depth=32)
+
+Approach:
+- The window is one of the incremental schedulers (simulator.incremental)
+  holding the first `depth` requests of the stream. Every dispatch pops
+  the policy's choice and admits the next request. The scheduler never
+  holds more than `depth` requests, so a dispatch is O(log depth).
+- requests can be any iterable and is read one request at a time.
+  replay_window keeps only totals and a fixed-size histogram, so a trace
+  of any length streams through in O(depth) memory; simulate_window also
+  keeps the positions (8 bytes per request) to build a SimulationResult.
+- depth=1 services the requests in FCFS order, but the head still moves
+  the way the policy does: SCAN, C-SCAN, N-step SCAN and FSCAN travel to
+  the disk edge before turning even for a single queued request, so
+  their seek totals are higher than FCFS. With depth >= the number of
+  requests every policy produces its usual whole-list schedule.
+- Deadline takes each request's write flag and BFQ its process (writes /
+  processes, any iterable in step with requests).
+
+Each request's queue wait is the head travel (tracks) from when it
+entered the window until it was serviced, including its own seek.
+"""
+
+from array import array
+from collections import namedtuple
+from itertools import islice
+
+from .algorithms import PROGRESS_EVERY, _done
+from .disk import SimulationResult
+from .incremental import SCHEDULERS, make_scheduler
+from .instrument import count, phase
+from .metrics import Histogram, summarize
+
+POLICIES = tuple(SCHEDULERS)
+DEFAULT_DEPTH = 32
+
+WindowStats = namedtuple(
+    "WindowStats",
+    ["algorithm", "depth", "requests", "total_seek", "average_seek", "wait"],
+)
+
+
+def iter_window(requests, disk, policy="sstf", depth=DEFAULT_DEPTH, step=10,
+                writes=None, processes=None, budget=16):
+    """
+    Yield (index, track, seek, via, wait) for every request in service
+    order, where index is its position in the stream and via the disk
+    edges passed on the way to it (see _Scheduler.via).
+
+    policy: one of POLICIES; step: batch size for 'nstep'
+    writes: write flag per request, for 'deadline'
+    processes, budget: process per request and budget, for 'bfq'
+    """
+    window = make_scheduler(policy, disk, step, budget)
+    tags = _tags(policy, writes, processes)
+    return _dispatch(window, requests, depth, tags)
+
+
+def _tags(policy, writes, processes):
+    # The per-request value that policy's add() takes as its third argument.
+    tags = {"deadline": writes, "bfq": processes}.get(policy)
+    if hasattr(tags, "tolist"):
+        tags = tags.tolist()
+    return tags
+
+
+def _dispatch(window, requests, depth, tags=None):
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    add, pop = window.add, window.pop
+    if tags is None:
+        source = iter(requests)
+
+        def admit(track):
+            add(track, window.total_seek)
+    else:
+        source = zip(requests, tags)
+
+        def admit(item):
+            add(item[0], window.total_seek, item[1])
+
+    for item in islice(source, depth):
+        admit(item)
+    while window:
+        track, index, admitted, seek = pop()
+        via = window.via
+        for item in islice(source, 1):
+            admit(item)
+        yield index, track, seek, via, window.total_seek - admitted
+
+
+def simulate_window(requests, disk, policy="sstf", depth=DEFAULT_DEPTH, step=10,
+                    writes=None, processes=None, budget=16, backend="python", progress=None):
+    """
+    Schedule requests with `policy` applied only within a sliding queue
+    of `depth` requests. Returns a SimulationResult named e.g.
+    "SSTF (depth 32)", comparable with the whole-list functions (with
+    service times if disk has a geometry). writes, processes and budget
+    are as for iter_window; backend is accepted for a uniform signature.
+    """
+    if hasattr(requests, "tolist"):
+        requests = requests.tolist()
+    total = len(requests) if hasattr(requests, "__len__") else None
+    positions = array("q", [disk.head])
+    waypoints = []
+    window = make_scheduler(policy, disk, step, budget)
+    tags = _tags(policy, writes, processes)
+
+    with phase("window.dispatch"):
+        done = 0
+        for _, track, _, via, _ in _dispatch(window, requests, depth, tags):
+            for edge in via:
+                waypoints.append(len(positions))
+                positions.append(edge)
+            positions.append(track)
+            done += 1
+            if progress is not None and done % PROGRESS_EVERY == 0:
+                progress(done, total)
+
+    count("window.decisions", done)
+    _done(progress, done)
+    return SimulationResult(
+        f"{window.name} (depth {depth})", positions, done, waypoints,
+        geometry=disk.geometry, backend=backend,
+    )
+
+
+def replay_window(requests, disk, policy="sstf", depth=DEFAULT_DEPTH, step=10,
+                  writes=None, processes=None, budget=16):
+    """
+    Stream requests (any iterable, e.g. simulator.traces.iter_trace)
+    through a queue of `depth` and return WindowStats with the seek
+    totals and a summary of queue waits (see metrics.summarize). Memory
+    does not grow with the length of the stream. writes and processes
+    may be iterables too (e.g. itertools.cycle for round-robin processes).
+    """
+    waits = Histogram()
+    record = waits.record
+    total_seek = 0
+    done = 0
+    window = make_scheduler(policy, disk, step, budget)
+    tags = _tags(policy, writes, processes)
+    with phase("window.replay"):
+        for _, _, seek, _, wait in _dispatch(window, requests, depth, tags):
+            total_seek += seek
+            record(wait)
+            done += 1
+    count("window.decisions", done)
+    return WindowStats(
+        window.name, depth, done, total_seek, total_seek / done if done else 0.0, summarize(waits),
+    )
@@ -0,0 +1,243 @@
+"""
+Seeded synthetic workloads.
+
+    w = generate("zipf", 1_000_000, size=100_000, seed=7)
+    simulate_sstf(w.tracks, disk)
+
+    for chunk in iter_workload("bursty", 50_000_000, size=100_000):
+        ...  # one CHUNK of requests at a time
+
+Kinds:
+  uniform     tracks uniform over the disk
+  zipf        hot spots: the disk is cut into `regions` equal regions
+              whose popularity follows Zipf(s); the hottest regions sit
+              at random places on the disk
+  sequential  runs of `run` consecutive tracks from random starts, each
+              step off by up to +-`jitter` tracks
+  bursty      bursts of `burst` requests clustered around a random track
+              (normal, sigma = spread x disk size), with arrival times:
+              `interval` apart inside a burst and `gap` idle between bursts
+  mixed       tracks of the `base` kind plus a write flag per request,
+              True with probability write_fraction
+
+Every generator returns a Workload(tracks, times, writes); times and
+writes are None for kinds that do not produce them. With NumPy installed
+the arrays are NumPy arrays built without a Python-level loop (millions
+of requests in well under a second); without it they are array('q') /
+array('d') / array('b') built with the random module.
+
+Approach:
+- A workload is produced in chunks of CHUNK requests. Chunk i draws from
+  its own generator seeded with (seed, i), and positions inside a chunk
+  (run and burst boundaries, arrival times) are computed from the global
+  request index. So iter_workload streams any length in fixed memory,
+  and generate() is just its chunks concatenated: the same seed gives the
+  same requests either way.
+- What belongs to the whole workload rather than to a chunk (the place of
+  each Zipf hot region) is drawn once from a generator seeded by the seed
+  alone and handed to every chunk, so chunks share one hot-spot layout.
+"""
+
+import random
+from array import array
+from collections import namedtuple
+from itertools import accumulate
+
+from . import vectorized
+
+KINDS = ("uniform", "zipf", "sequential", "bursty", "mixed")
+CHUNK = 1 << 20
+
+Workload = namedtuple("Workload", ["tracks", "times", "writes"])
+
+
+def _rng(seed, chunk, numpy):
+    # chunk=None gives the per-workload layout generator; its stream is
+    # independent of every chunk's.
+    if numpy:
+        if chunk is None:
+            return numpy.random.default_rng(numpy.random.SeedSequence(seed, spawn_key=(0,)))
+        return numpy.random.default_rng([seed, chunk])
+    if chunk is None:
+        return random.Random(f"{seed}/layout")
+    return random.Random(seed * 1_000_003 + chunk)
+
+
+# Each _kind(rng, start, n, size, numpy, **options) returns a Workload for
+# requests start .. start+n-1; numpy is the numpy module, or None for the
+# pure-Python path.
+
+def _uniform(rng, start, n, size, numpy):
+    if numpy:
+        return Workload(rng.integers(0, size, n, dtype=numpy.int64), None, None)
+    return Workload(array("q", rng.choices(range(size), k=n)), None, None)
+
+
+def _zipf_layout(rng, size, numpy, regions=1024, **_):
+    # Which region holds each popularity rank, shared by all chunks.
+    regions = max(1, min(regions, size))
+    if numpy:
+        return {"order": rng.permutation(regions)}
+    order = list(range(regions))
+    rng.shuffle(order)
+    return {"order": order}
+
+
+def _zipf(rng, start, n, size, numpy, s=1.2, regions=1024, order=None):
+    regions = max(1, min(regions, size))
+    if order is None:
+        order = _zipf_layout(rng, size, numpy, regions)["order"]
+    width = size / regions
+    weights = [1.0 / (k ** s) for k in range(1, regions + 1)]
+    if numpy:
+        cdf = numpy.cumsum(weights)
+        cdf /= cdf[-1]
+        rank = numpy.minimum(numpy.searchsorted(cdf, rng.random(n), side="right"), regions - 1)
+        region = order[rank]
+        tracks = ((region + rng.random(n)) * width).astype(numpy.int64)
+        return Workload(numpy.minimum(tracks, size - 1), None, None)
+
+    ranks = rng.choices(range(regions), cum_weights=list(accumulate(weights)), k=n)
+    r = rng.random
+    last = size - 1
+    return Workload(
+        array("q", (min(last, int((order[k] + r()) * width)) for k in ranks)), None, None
+    )
+
+
+def _sequential(rng, start, n, size, numpy, run=64, jitter=2):
+    # Run boundaries follow the global index; every run in this chunk
+    # (including a partial first one) gets a fresh random start.
+    first = start // run
+    runs = (start + n - 1) // run - first + 1
+    if numpy:
+        index = numpy.arange(start, start + n, dtype=numpy.int64)
+        starts = rng.integers(0, size, runs, dtype=numpy.int64)
+        tracks = (starts[index // run - first] + index % run) % size
+        if jitter:
+            tracks += rng.integers(-jitter, jitter + 1, n, dtype=numpy.int64)
+        return Workload(numpy.clip(tracks, 0, size - 1), None, None)
+
+    starts = [rng.randrange(size) for _ in range(runs)]
+    last = size - 1
+    tracks = array("q")
+    for i in range(start, start + n):
+        track = (starts[i // run - first] + i % run) % size
+        if jitter:
+            track += rng.randint(-jitter, jitter)
+        tracks.append(min(last, max(0, track)))
+    return Workload(tracks, None, None)
+
+
+def _bursty(rng, start, n, size, numpy, burst=256, spread=0.01, interval=1.0, gap=1000.0):
+    sigma = max(1.0, size * spread)
+    period = burst * interval + gap
+    first = start // burst
+    bursts = (start + n - 1) // burst - first + 1
+    if numpy:
+        index = numpy.arange(start, start + n, dtype=numpy.int64)
+        which = index // burst
+        centers = rng.integers(0, size, bursts, dtype=numpy.int64)
+        tracks = numpy.rint(centers[which - first] + rng.normal(0.0, sigma, n)).astype(numpy.int64)
+        times = which * period + (index % burst) * interval
+        return Workload(numpy.clip(tracks, 0, size - 1), times.astype(numpy.float64), None)
+
+    centers = [rng.randrange(size) for _ in range(bursts)]
+    gauss = rng.gauss
+    last = size - 1
+    tracks = array("q")
+    times = array("d")
+    for i in range(start, start + n):
+        which = i // burst
+        tracks.append(min(last, max(0, round(centers[which - first] + gauss(0.0, sigma)))))
+        times.append(which * period + (i % burst) * interval)
+    return Workload(tracks, times, None)
+
+
+def _mixed(rng, start, n, size, numpy, write_fraction=0.3, base="uniform", **options):
+    if base not in _GENERATORS or base == "mixed":
+        raise ValueError(f"Unsupported base kind {base!r}")
+    tracks, times, _ = _GENERATORS[base](rng, start, n, size, numpy, **options)
+    if numpy:
+        return Workload(tracks, times, rng.random(n) < write_fraction)
+    r = rng.random
+    return Workload(tracks, times, array("b", (r() < write_fraction for _ in range(n))))
+
+
+_GENERATORS = {
+    "uniform": _uniform,
+    "zipf": _zipf,
+    "sequential": _sequential,
+    "bursty": _bursty,
+    "mixed": _mixed,
+}
+
+# Per-workload state, drawn once: _layout(rng, size, numpy, **options)
+# returns extra options passed to every chunk of that kind.
+_LAYOUTS = {
+    "zipf": _zipf_layout,
+}
+
+
+def iter_workload(kind, n, size, seed=0, chunk=CHUNK, backend="numpy", **options):
+    """
+    Yield the workload as Workload chunks of up to `chunk` requests.
+
+    kind: one of KINDS; options are that kind's parameters (see above)
+    n: total number of requests
+    size: disk size in tracks
+    backend: 'numpy' (default, falls back to Python without NumPy) or
+             'python'
+    """
+    if kind not in _GENERATORS:
+        raise ValueError(f"Unsupported workload {kind!r}, expected one of {KINDS}")
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    numpy = vectorized.np if vectorized.use_numpy(backend) else None
+    make = _GENERATORS[kind]
+    base = options.get("base", "uniform") if kind == "mixed" else kind
+    if base in _LAYOUTS:
+        options.update(_LAYOUTS[base](_rng(seed, None, numpy), size, numpy, **options))
+    for i, start in enumerate(range(0, n, chunk)):
+        yield make(_rng(seed, i, numpy), start, min(chunk, n - start), size, numpy, **options)
+
+
+def generate(kind, n, size, seed=0, chunk=CHUNK, backend="numpy", **options):
+    """The whole workload as one Workload of arrays (see iter_workload)."""
+    parts = list(iter_workload(kind, n, size, seed, chunk, backend, **options))
+    numpy = vectorized.np if vectorized.use_numpy(backend) else None
+    if not parts:
+        empty = numpy.empty(0, dtype=numpy.int64) if numpy else array("q")
+        return Workload(empty, None, None)
+    if len(parts) == 1:
+        return parts[0]
+
+    def join(field):
+        values = [getattr(p, field) for p in parts]
+        if values[0] is None:
+            return None
+        if numpy:
+            return numpy.concatenate(values)
+        out = values[0]
+        for v in values[1:]:
+            out.extend(v)
+        return out
+
+    return Workload(join("tracks"), join("times"), join("writes"))
+
+
+def parse_options(pairs):
+    """Turn ["s=1.1", "run=32", "base=zipf"] into keyword arguments."""
+    options = {}
+    for pair in pairs or ():
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"workload option must be NAME=VALUE, got {pair!r}")
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                pass
+        options[name] = value
+    return options
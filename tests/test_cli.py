@@ -0,0 +1,37 @@
+import pytest
+
+import run_sim
+
+
+@pytest.fixture
+def trace(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text("sector\n0\n630\n1260\n")
+    return str(path)
+
+
+def test_head_out_of_range_is_rejected_when_streaming_a_trace(trace):
+    with pytest.raises(ValueError, match="Head position 5000"):
+        run_sim.main(["-d", "200", "-H", "5000", "-t", trace,
+                      "--queue-depth", "32", "-o", "summary"])
+
+
+def test_streamed_trace_summary(trace, capsys):
+    run_sim.main(["-d", "200", "-H", "5", "-t", trace, "--queue-depth", "32", "-o", "summary"])
+    assert capsys.readouterr().out
+
+
+@pytest.mark.parametrize("requests", ["1,2,-3", "1,2,400"])
+def test_raid_rejects_requests_outside_the_array(requests):
+    with pytest.raises(ValueError, match="out of array range"):
+        run_sim.main(["raid", "-r", requests, "-d", "100", "-m", "2", "-j", "0"])
+
+
+def test_compare_reads_the_trace_column_and_prints_a_github_table(tmp_path, capsys):
+    path = tmp_path / "trace.csv"
+    path.write_text("op,sector\nR,100\nR,5000\nR,12000\n")
+    run_sim.main(["compare", "-t", str(path), "--trace-column", "1",
+                  "--total-sectors", "20000", "-a", "fcfs,sstf"])
+    out = capsys.readouterr().out
+    assert out.startswith("| Algorithm")
+    assert "| FCFS " in out and "| SSTF " in out
@@ -0,0 +1,40 @@
+from array import array
+
+import pytest
+
+from simulator import vectorized
+from simulator.algorithms import simulate_fcfs
+from simulator.disk import Disk
+
+needs_numpy = pytest.mark.skipif(not vectorized.HAVE_NUMPY, reason="NumPy not installed")
+
+
+def _requests(n, size):
+    return [(i * 7919) % size for i in range(n)]
+
+
+@needs_numpy
+def test_python_backend_metrics_stay_pure_python(monkeypatch):
+    requests = _requests(vectorized.MIN_LENGTH * 2, 1000)
+    result = simulate_fcfs(requests, Disk(1000, 500), backend="python")
+    assert result.backend == "python"
+
+    def fail(positions):
+        raise AssertionError("NumPy used for a python-backend result")
+
+    monkeypatch.setattr(vectorized, "seek_distances", fail)
+    expected = sum(abs(b - a) for a, b in zip([500] + requests, requests))
+    assert result.total_seek == expected
+    assert isinstance(result.seek_distances, array)
+    assert sum(result.seek_distances) == expected
+
+
+@needs_numpy
+def test_numpy_backend_metrics_match_python():
+    requests = _requests(vectorized.MIN_LENGTH * 2, 1000)
+    disk = Disk(1000, 500)
+    py = simulate_fcfs(requests, disk, backend="python")
+    vec = simulate_fcfs(requests, disk, backend="numpy")
+    assert vec.backend == "numpy"
+    assert vec.total_seek == py.total_seek
+    assert list(vec.seek_distances) == list(py.seek_distances)
@@ -0,0 +1,11 @@
+import pytest
+
+from simulator.algorithms import simulate_fcfs
+from simulator.disk import Disk
+from simulator.raid import simulate_array
+
+
+@pytest.mark.parametrize("layout", ["raid0", "raid1", "raid10"])
+def test_negative_logical_request_is_rejected(layout):
+    with pytest.raises(ValueError, match="Negative logical request -5"):
+        simulate_array([1, -5, 3], Disk(10), simulate_fcfs, layout=layout, members=2, workers=0)
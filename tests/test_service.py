@@ -0,0 +1,49 @@
+import asyncio
+import os
+import socket
+
+import pytest
+
+from simulator.disk import Disk
+from simulator.service import BlockQueueService
+
+
+def _start(path):
+    async def run():
+        service = BlockQueueService(Disk(200, 50))
+        try:
+            return await service.start_unix(path)
+        finally:
+            await service.close()
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "svc.sock")
+
+
+def test_stale_socket_is_replaced(path):
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(path)
+    stale.close()
+    assert _start(path) == ("unix", path)
+
+
+def test_socket_of_a_live_service_is_left_alone(path):
+    live = socket.socket(socket.AF_UNIX)
+    live.bind(path)
+    live.listen()
+    try:
+        with pytest.raises(OSError, match="in use"):
+            _start(path)
+        assert os.path.exists(path)
+    finally:
+        live.close()
+
+
+def test_other_files_are_left_alone(path):
+    with open(path, "w"):
+        pass
+    with pytest.raises(FileExistsError):
+        _start(path)
@@ -0,0 +1,14 @@
+import pytest
+
+pytest.importorskip("tkinter")
+import tk_gui  # noqa: E402
+
+
+def test_bin_requests_clamps_tracks_outside_the_disk():
+    assert tk_gui.bin_requests([-5, 0, 199, 250], 200, 30, 39) == [2] + [0] * 8 + [2]
+
+
+def test_labelled_markers_depend_on_the_track_width():
+    assert tk_gui.labelled_markers_fit(40, 0, 199)
+    assert not tk_gui.labelled_markers_fit(41, 0, 199)
+    assert tk_gui.labelled_markers_fit(400, 0, 1999)
@@ -0,0 +1,22 @@
+from collections import Counter
+
+import pytest
+
+from simulator import vectorized
+from simulator.workloads import iter_workload
+
+BACKENDS = ["python", pytest.param("numpy", marks=pytest.mark.skipif(
+    not vectorized.HAVE_NUMPY, reason="NumPy not installed"))]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("kind, options", [("zipf", {}), ("mixed", {"base": "zipf"})])
+def test_zipf_hot_region_is_the_same_in_every_chunk(backend, kind, options):
+    size, regions = 10_000, 100
+    width = size // regions
+    hottest = set()
+    for chunk in iter_workload(kind, 20_000, size, seed=3, chunk=5_000, backend=backend,
+                               regions=regions, **options):
+        counts = Counter(int(t) // width for t in chunk.tracks)
+        hottest.add(counts.most_common(1)[0][0])
+    assert len(hottest) == 1
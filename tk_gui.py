@@ -16,6 +16,7 @@ If names differ, adjust the imports below.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
+import queue
 import time
 import math
 
@@ -27,11 +28,25 @@ try:
         simulate_sstf,
         simulate_scan,
         simulate_cscan,
+        simulate_look,
+        simulate_clook,
+        simulate_nstep_scan,
+        simulate_fscan,
+        simulate_sptf,
+        SimulationCancelled,
     )
+    from simulator.cache import ResultCache
+    from simulator.workloads import KINDS, generate
 except Exception as e:
     # If import fails, provide helpful message in GUI later
     Disk = None
     simulate_fcfs = simulate_sstf = simulate_scan = simulate_cscan = None
+    simulate_look = simulate_clook = simulate_nstep_scan = simulate_fscan = None
+    simulate_sptf = None
+    SimulationCancelled = Exception
+    ResultCache = None
+    KINDS = ("uniform",)
+    generate = None
     IMPORT_ERROR = str(e)
 else:
     IMPORT_ERROR = None
@@ -44,6 +59,42 @@ def parse_requests(s):
     except Exception:
         return None
 
+# How often the GUI checks the background simulation's queue.
+WORKER_POLL_MS = 50
+# Generated workloads longer than this are kept out of the requests entry,
+# which then shows a placeholder label instead.
+MAX_ENTRY_REQUESTS = 64
+
+# The track view draws one labelled marker per request while each gets
+# at least this many pixels of track; denser queues are drawn as a
+# per-pixel density strip instead.
+PIXELS_PER_LABELLED_MARKER = 5
+
+
+def labelled_markers_fit(count, x0, x1):
+    """True if `count` labelled markers fit on the track from x0 to x1."""
+    return count * PIXELS_PER_LABELLED_MARKER <= x1 - x0 + 1
+
+
+def bin_requests(requests, disk_size, x0, x1):
+    """
+    Count requests per pixel column between x0 and x1 (inclusive), using
+    the same track -> x mapping as the track view. Tracks outside the
+    disk are counted in the edge column they lie beyond.
+    """
+    width = max(1, x1 - x0 + 1)
+    counts = [0] * width
+    if disk_size <= 1:
+        counts[width // 2] = len(requests)
+        return counts
+    span = x1 - x0
+    last = disk_size - 1
+    top = width - 1
+    for r in requests:
+        counts[min(top, max(0, int(r / last * span)))] += 1
+    return counts
+
+
 # --- Main Application ---
 class DiskGUI(tk.Tk):
     def __init__(self):
@@ -57,9 +108,33 @@ class DiskGUI(tk.Tk):
             "SSTF": simulate_sstf,
             "SCAN": simulate_scan,
             "C-SCAN": simulate_cscan,
+            "LOOK": simulate_look,
+            "C-LOOK": simulate_clook,
+            "N-step SCAN": simulate_nstep_scan,
+            "FSCAN": simulate_fscan,
+            "SPTF": simulate_sptf,
         }
 
         self.current_result = None
+        # Last generated workload too long for the entry, and the label
+        # shown in the entry in its place.
+        self.generated_requests = None
+        self.generated_label = None
+        # Re-running an algorithm on unchanged inputs (e.g. toggling back
+        # and forth between algorithms) is served from this cache.
+        self.cache = ResultCache() if ResultCache is not None else None
+        # Virtual step table state: first visible step row, rows that fit
+        # on screen, the reusable Treeview items and the selected step.
+        self._table_offset = 0
+        self._table_rows = 20
+        self._row_items = []
+        self._selected_step = 0
+        # Background simulation: worker thread, its message queue, the
+        # cancel flag it checks, and the after() id of the queue poller.
+        self.worker = None
+        self.worker_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.poll_after_id = None
         self.animation_running = False
         self.animation_after_id = None
         self.animation_delay_ms = 400
@@ -97,11 +172,23 @@ class DiskGUI(tk.Tk):
         algo_menu = ttk.Combobox(left_in, textvariable=self.algo_var, values=list(self.algos.keys()), state="readonly", width=15)
         algo_menu.grid(row=9, column=0, sticky="w", padx=4, pady=2)
 
-        run_btn = ttk.Button(left_in, text="Run Simulation", command=self.run_simulation)
-        run_btn.grid(row=10, column=0, sticky="w", padx=4, pady=(8,2))
+        run_row = ttk.Frame(left_in)
+        run_row.grid(row=10, column=0, sticky="w", padx=4, pady=(8,2))
+        self.run_btn = ttk.Button(run_row, text="Run Simulation", command=self.run_simulation)
+        self.run_btn.pack(side="left")
+        self.cancel_btn = ttk.Button(run_row, text="Cancel", command=self.cancel_simulation, state="disabled")
+        self.cancel_btn.pack(side="left", padx=(6,0))
 
-        random_btn = ttk.Button(left_in, text="Random example (8)", command=self.set_random_requests)
-        random_btn.grid(row=11, column=0, sticky="w", padx=4, pady=(2,2))
+        self.progress = ttk.Progressbar(left_in, orient="horizontal", length=240, mode="determinate", maximum=1.0)
+        self.progress.grid(row=11, column=0, sticky="w", padx=4, pady=(2,2))
+
+        workload_row = ttk.Frame(left_in)
+        workload_row.grid(row=12, column=0, sticky="w", padx=4, pady=(2,2))
+        self.workload_var = tk.StringVar(value=KINDS[0])
+        ttk.Combobox(workload_row, textvariable=self.workload_var, values=list(KINDS), state="readonly", width=11).pack(side="left")
+        self.workload_count_var = tk.IntVar(value=8)
+        ttk.Entry(workload_row, textvariable=self.workload_count_var, width=9).pack(side="left", padx=(6,0))
+        ttk.Button(workload_row, text="Generate", command=self.set_random_requests).pack(side="left", padx=(6,0))
 
         # Middle controls (play/step/metrics)
         mid = ttk.Frame(top)
@@ -150,9 +237,14 @@ class DiskGUI(tk.Tk):
             self.tree.heading(c, text=c)
             self.tree.column(c, width=90, anchor="center")
         self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        # The table is virtual: the Treeview only ever holds one screenful
+        # of rows, and this scrollbar moves a window over the result.
+        self.table_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.on_table_scroll)
+        self.table_scrollbar.pack(side="right", fill="y")
+        self.tree.bind("<Configure>", self.on_table_resize)
+        self.tree.bind("<MouseWheel>", self.on_table_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_table(-3) or "break")
+        self.tree.bind("<Button-5>", lambda e: self.scroll_table(3) or "break")
 
         # Bottom status
         self.status_var = tk.StringVar(value="Ready")
@@ -170,15 +262,31 @@ class DiskGUI(tk.Tk):
 
     def set_random_requests(self):
         import random
-        n = 8
-        size = max(50, self.disk_size_var.get())
-        reqs = ",".join(str(random.randint(0, size-1)) for _ in range(n))
-        self.requests_var.set(reqs)
+        kind = self.workload_var.get()
+        try:
+            n = int(self.workload_count_var.get())
+            size = int(self.disk_size_var.get())
+            seed = random.randrange(1 << 31)
+            tracks = generate(kind, n, size, seed=seed).tracks.tolist()
+        except Exception as e:
+            messagebox.showerror("Workload error", f"Could not generate workload: {e}")
+            return
+        if n <= MAX_ENTRY_REQUESTS:
+            self.generated_requests = self.generated_label = None
+            self.requests_var.set(",".join(map(str, tracks)))
+        else:
+            self.generated_requests = tracks
+            self.generated_label = f"<{kind} workload: {n} requests, seed {seed}>"
+            self.requests_var.set(self.generated_label)
+        self.status_var.set(f"Generated {n} {kind} requests (seed {seed})")
 
     def run_simulation(self):
         # Parse inputs and call simulation function
         req_text = self.requests_var.get()
-        requests = parse_requests(req_text)
+        if self.generated_label is not None and req_text == self.generated_label:
+            requests = self.generated_requests
+        else:
+            requests = parse_requests(req_text)
         if requests is None:
             messagebox.showerror("Input error", "Requests must be comma-separated integers.")
             return
@@ -199,12 +307,91 @@ class DiskGUI(tk.Tk):
             messagebox.showerror("Disk error", f"Could not create Disk: {e}")
             return
 
+        if self.worker is not None:
+            return
+        if self.animation_running:
+            self.stop_animation()
+
+        # Run the simulation off the Tk main loop. The worker only talks
+        # to the GUI through worker_queue, which _poll_worker drains.
+        self.cancel_event.clear()
+        self.worker_queue = queue.Queue()
+        self.worker = threading.Thread(
+            target=self._simulate_in_background,
+            args=(sim_fn, requests, disk, self.worker_queue),
+            daemon=True,
+        )
+        self.run_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self.progress["value"] = 0
+        self.status_var.set(f"Running {algo_name} on {len(requests)} requests…")
+        self.worker.start()
+        self.poll_after_id = self.after(WORKER_POLL_MS, self._poll_worker, algo_name, size, requests)
+
+    def _simulate_in_background(self, sim_fn, requests, disk, out):
+        # Runs on the worker thread: no Tk calls in here.
+        def progress(done, total):
+            if self.cancel_event.is_set():
+                raise SimulationCancelled()
+            out.put(("progress", done, total))
+
         try:
-            res = sim_fn(requests, disk)
+            if self.cache is not None:
+                res = self.cache.run(sim_fn, requests, disk, progress=progress)
+            else:
+                res = sim_fn(requests, disk, progress=progress)
+        except SimulationCancelled:
+            out.put(("cancelled",))
         except Exception as e:
-            messagebox.showerror("Simulation error", f"Algorithm raised an error:\n{e}")
+            out.put(("error", e))
+        else:
+            out.put(("done", res))
+
+    def cancel_simulation(self):
+        if self.worker is not None:
+            self.cancel_event.set()
+            self.status_var.set("Cancelling…")
+
+    def _finish_worker(self):
+        self.worker = None
+        self.poll_after_id = None
+        self.run_btn.config(state="normal")
+        self.cancel_btn.config(state="disabled")
+
+    def _poll_worker(self, algo_name, size, requests):
+        # Drain everything the worker has sent since the last poll; only
+        # the latest progress value matters.
+        message = None
+        try:
+            while True:
+                message = self.worker_queue.get_nowait()
+                if message[0] != "progress":
+                    break
+                _, done, total = message
+                if total:
+                    self.progress["value"] = done / total
+        except queue.Empty:
+            pass
+
+        if message is None or message[0] == "progress":
+            self.poll_after_id = self.after(WORKER_POLL_MS, self._poll_worker, algo_name, size, requests)
             return
 
+        self._finish_worker()
+        if message[0] == "cancelled":
+            self.progress["value"] = 0
+            self.status_var.set(f"{algo_name} cancelled")
+            return
+        if message[0] == "error":
+            self.status_var.set("Simulation failed")
+            messagebox.showerror("Simulation error", f"Algorithm raised an error:\n{message[1]}")
+            return
+
+        res = message[1]
+        self.progress["value"] = 1.0
+        self.show_result(res, algo_name, size, requests)
+
+    def show_result(self, res, algo_name, size, requests):
         # store result
         self.current_result = res
         # prepare UI for result
@@ -216,7 +403,11 @@ class DiskGUI(tk.Tk):
         self.step_slider.config(from_=0, to=max_step)
         self.step_var.set(0)
         self.step_slider.set(0)
-        self.status_var.set(f"Ran {algo_name} — {len(res.positions)-1} steps")
+        status = f"Ran {algo_name} — {len(res.positions)-1} steps"
+        if self.cache is not None:
+            stats = self.cache.stats()
+            status += f" (cache: {stats.hits} hits, {stats.misses} misses)"
+        self.status_var.set(status)
 
     def populate_metrics(self, res):
         self.metrics_text.delete("1.0", tk.END)
@@ -225,20 +416,94 @@ class DiskGUI(tk.Tk):
         if isinstance(avg, float):
             avg = f"{avg:.2f}"
         self.metrics_text.insert(tk.END, f"Average seek: {avg}\n")
+        if getattr(res, "service_times", None) is not None:
+            self.metrics_text.insert(tk.END, f"Total service: {res.total_service_ms:.2f} ms\n")
+            self.metrics_text.insert(tk.END, f"Average service: {res.average_service_ms:.2f} ms\n")
         # show steps
         steps = max(0, len(getattr(res, "positions", [])) - 1)
         self.metrics_text.insert(tk.END, f"Steps: {steps}\n")
 
     def populate_table(self, res):
-        # clear
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        positions = getattr(res, "positions", [])
-        for i in range(1, len(positions)):
-            frm = positions[i-1]
-            to = positions[i]
-            seek = abs(to - frm)
-            self.tree.insert("", "end", values=(i, frm, to, seek))
+        # Nothing is inserted per step: the table shows a window onto
+        # res.positions and rows are formatted only when they are visible.
+        self._table_offset = 0
+        self._selected_step = 0
+        self.render_table()
+
+    def _table_length(self):
+        if not self.current_result:
+            return 0
+        return max(0, len(self.current_result.positions) - 1)
+
+    def _ensure_row_items(self):
+        # Keep exactly one Treeview item per visible row and reuse them.
+        while len(self._row_items) < self._table_rows:
+            self._row_items.append(self.tree.insert("", "end", values=("", "", "", "")))
+        while len(self._row_items) > self._table_rows:
+            self.tree.delete(self._row_items.pop())
+
+    def render_table(self):
+        self._ensure_row_items()
+        total = self._table_length()
+        self._table_offset = max(0, min(self._table_offset, total - self._table_rows))
+        positions = self.current_result.positions if self.current_result else []
+        selected = None
+        for k, item in enumerate(self._row_items):
+            step = self._table_offset + k + 1
+            if step <= total:
+                frm = positions[step - 1]
+                to = positions[step]
+                self.tree.item(item, values=(step, frm, to, abs(to - frm)))
+                if step == self._selected_step:
+                    selected = item
+            else:
+                self.tree.item(item, values=("", "", "", ""))
+        if selected is not None:
+            self.tree.selection_set(selected)
+        else:
+            self.tree.selection_set(())
+        if total:
+            first = self._table_offset / total
+            last = min(1.0, (self._table_offset + self._table_rows) / total)
+            self.table_scrollbar.set(first, last)
+        else:
+            self.table_scrollbar.set(0.0, 1.0)
+
+    def scroll_table(self, delta):
+        self._table_offset += delta
+        self.render_table()
+
+    def on_table_scroll(self, action, value, unit=None):
+        total = self._table_length()
+        if action == "moveto":
+            self._table_offset = int(float(value) * total)
+        elif action == "scroll":
+            step = self._table_rows if unit == "pages" else 1
+            self._table_offset += int(value) * step
+        self.render_table()
+
+    def on_table_wheel(self, event):
+        self.scroll_table(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def on_table_resize(self, event):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # leave room for the heading row
+        rows = max(1, event.height // rowheight - 1)
+        if rows != self._table_rows:
+            self._table_rows = rows
+            self.render_table()
+
+    def select_step(self, step):
+        # O(1) in the number of steps: scroll only if the row is off
+        # screen, then re-render the fixed set of visible rows.
+        self._selected_step = step
+        if step > 0:
+            if step <= self._table_offset:
+                self._table_offset = step - 1
+            elif step > self._table_offset + self._table_rows:
+                self._table_offset = step - self._table_rows
+        self.render_table()
 
     def prepare_canvas(self, res, disk_size, requests):
         # clear canvas
@@ -252,15 +517,36 @@ class DiskGUI(tk.Tk):
         # draw baseline
         self.canvas.create_line(self._track_x0, self._track_y, self._track_x1, self._track_y, fill="#888", width=2)
         # draw request markers
-        self._req_positions = []
-        for r in requests:
-            x = self._map_track_to_x(r, disk_size)
-            self.canvas.create_text(x, self._track_y - 14, text=str(r), font=("TkDefaultFont", 8), fill="black")
-            self.canvas.create_line(x, self._track_y - 6, x, self._track_y + 6, fill="red", width=2)
-            self._req_positions.append((r, x))
+        if labelled_markers_fit(len(requests), self._track_x0, self._track_x1):
+            for r in requests:
+                x = self._map_track_to_x(r, disk_size)
+                self.canvas.create_text(x, self._track_y - 14, text=str(r), font=("TkDefaultFont", 8), fill="black")
+                self.canvas.create_line(x, self._track_y - 6, x, self._track_y + 6, fill="red", width=2)
+        else:
+            self.draw_density_strip(requests, disk_size)
         # draw initial head (if positions exist)
         self.draw_head_at_step(0)
 
+    def draw_density_strip(self, requests, disk_size):
+        # Level of detail for large queues: count requests per pixel column
+        # and draw one bar per non-empty column, its height scaled by the
+        # log of the count. The number of canvas items is bounded by the
+        # canvas width, not by the number of requests.
+        counts = bin_requests(requests, disk_size, self._track_x0, self._track_x1)
+        peak = max(counts) if counts else 0
+        if not peak:
+            return
+        scale = math.log1p(peak)
+        top = self._track_y - 8
+        for i, count in enumerate(counts):
+            if count:
+                x = self._track_x0 + i
+                height = 4 + 22 * math.log1p(count) / scale
+                self.canvas.create_line(x, top, x, top - height, fill="red")
+        self.canvas.create_text(self._track_x0, top - 34, anchor="w",
+                                text=f"{len(requests)} requests (peak {peak} per pixel)",
+                                font=("TkDefaultFont", 8))
+
     def _map_track_to_x(self, track, disk_size):
         # map track number to canvas x coordinate
         x0 = self._track_x0
@@ -292,17 +578,8 @@ class DiskGUI(tk.Tk):
         idx = int(float(val))
         self.step_var.set(idx)
         self.draw_head_at_step(idx)
-        # highlight corresponding row in treeview
-        children = self.tree.get_children()
-        if children:
-            # clear selection
-            for c in children:
-                self.tree.selection_remove(c)
-            # select row with Step == idx
-            if idx > 0 and idx <= len(children):
-                target = children[idx-1]
-                self.tree.selection_set(target)
-                self.tree.see(target)
+        # highlight corresponding row in the step table
+        self.select_step(idx)
 
     def toggle_animation(self):
         if self.animation_running: